@@ -2,20 +2,28 @@
 
 import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
-from functools import partial
+import re
+from collections import deque
+from contextlib import aclosing, suppress
+from dataclasses import astuple
+from datetime import datetime, timezone
+from functools import lru_cache
+from threading import Lock
 from typing import Any, AsyncGenerator
-from urllib.parse import urlparse
+from urllib.parse import ParseResult, urlparse
 
-from bs4 import BeautifulSoup
+import httpx
+from cachetools import LRUCache
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
 from supabase import Client
 
-from app.analyzer import PageAnalyzer
+from app.analyzer import PageAnalyzer, parse_html_document
 from app.config import Settings
-from app.config_manager import ConfigManager
+from app.config_manager import ConfigManager, get_config_manager
 from app.job_manager import get_job_manager
 from app.models import (
     AnalysisResult,
@@ -26,28 +34,115 @@ from app.models import (
     FRAMEWORK_PRESETS,
 )
 from app.schemas import CrawlResult, ExtractionMode
-from app.settings_loader import CrawlerConfig, SettingsLoader
+from app.settings_loader import (
+    AdaptiveSettings,
+    CrawlerConfig,
+    LLMSettings,
+    SettingsLoader,
+)
 from app.validator import ContentValidator
 
 logger = logging.getLogger(__name__)
 
-_executor = ThreadPoolExecutor(max_workers=4)
+_UTC = timezone.utc
 
+# Subtrees that never help selector inference and only inflate LLM input.
+_ANALYSIS_STRIP_TAGS = ("script", "style", "noscript", "svg", "template")
 
-def _run_in_new_loop(coro_func: Any, *args: Any, **kwargs: Any) -> Any:
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(coro_func(*args, **kwargs))
-        logger.info(
-            f"_run_in_new_loop completed, result count: {len(result) if isinstance(result, list) else 'N/A'}"
-        )
-        return result
-    except Exception as e:
-        logger.error(f"_run_in_new_loop error: {e}", exc_info=True)
-        raise
-    finally:
-        loop.close()
+_HTTP_USER_AGENT = "Mozilla/5.0 (compatible; AxonDocCrawler/0.2)"
+
+# Raw bytes read per character of analysis budget. Script/style bodies are
+# stripped after the cut, so the window is generous; bytes past it are never
+# downloaded or decoded.
+_ANALYSIS_BYTES_PER_CHAR = 16
+
+# A plain-HTTP page with less visible text than this is taken to be a
+# JavaScript shell and is rendered in the browser before analysis.
+_MIN_ANALYSIS_TEXT_CHARS = 200
+
+# How often buffered site-config success/failure counts are written back.
+_COUNTER_FLUSH_INTERVAL_SECONDS = 5.0
+
+# Per-page progress is logged at INFO for the first few pages and then every
+# this many pages; the rest go to DEBUG.
+_PAGE_LOG_INTERVAL = 25
+
+_TITLE_TAG_PROBE = re.compile(r"<(?:title|h1)[\s>]", re.IGNORECASE)
+
+
+def _element_text(element: Any) -> str:
+    return " ".join(element.text_content().split())
+
+
+@lru_cache(maxsize=2048)
+def _cached_urlparse(url: str) -> ParseResult:
+    """urlparse is pure Python; retries and config lookups reparse the same URL."""
+    return urlparse(url)
+
+
+@lru_cache(maxsize=256)
+def _compile_title_selectors(title_selector: str | None) -> tuple[CSSSelector, ...]:
+    """Split a comma-separated title selector and compile each part once."""
+    if not title_selector:
+        return ()
+
+    compiled: list[CSSSelector] = []
+    for selector in title_selector.split(","):
+        selector = selector.strip()
+        if not selector:
+            continue
+        try:
+            compiled.append(CSSSelector(selector))
+        except Exception as e:
+            logger.debug(f"Skipping invalid title selector {selector!r}: {e}")
+    return tuple(compiled)
+
+
+class _ConcurrencyLimiter:
+    """Async semaphore whose limit can change while slots are held.
+
+    Swapping in a new asyncio.Semaphore on a settings reload would let tasks
+    still holding the old one run on top of a full set of new slots.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    def set_limit(self, limit: int) -> None:
+        """Lowering the limit only holds back new entries until enough exit."""
+        self._limit = limit
+        self._wake()
+
+    async def __aenter__(self) -> None:
+        while self._active >= self._limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Hand the wake-up this task won't use to the next waiter
+                    self._wake()
+                raise
+            finally:
+                with suppress(ValueError):
+                    self._waiters.remove(waiter)
+        self._active += 1
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self._limit - self._active
+        for waiter in self._waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
 
 
 class AdaptiveCrawler:
@@ -60,13 +155,197 @@ class AdaptiveCrawler:
         self._client = supabase_client
         self._settings = settings
         self._crawler_config = crawler_config
-        self._config_manager = ConfigManager(supabase_client)
-        self._analyzer = PageAnalyzer(crawler_config.llm)
-        self._validator = ContentValidator(crawler_config.adaptive)
+        self._config_manager = get_config_manager(supabase_client)
+        self._analyzer = get_page_analyzer(crawler_config.llm)
+        self._validator = get_content_validator(crawler_config.adaptive)
         self._browser_config = BrowserConfig(
             headless=True,
             verbose=False,
         )
+        self._run_config_cache: LRUCache[tuple[Any, ...], CrawlerRunConfig] = (
+            LRUCache(maxsize=128)
+        )
+        self._raw_fetch_config = CrawlerRunConfig(
+            wait_until=settings.crawler_wait_until,
+            page_timeout=settings.crawler_timeout,
+        )
+        self._crawler: AsyncWebCrawler | None = None
+        self._crawler_lock = asyncio.Lock()
+        self._http_client: httpx.AsyncClient | None = None
+        self._crawl_limiter = _ConcurrencyLimiter(
+            crawler_config.adaptive.max_concurrency or 64
+        )
+        self._counter_flush_task: asyncio.Task[None] | None = None
+
+    async def _ensure_crawler(self) -> AsyncWebCrawler:
+        """Start the shared browser on first use and reuse it afterwards."""
+        if self._crawler is not None:
+            return self._crawler
+
+        async with self._crawler_lock:
+            if self._crawler is None:
+                crawler = AsyncWebCrawler(config=self._browser_config)
+                await crawler.start()
+                self._crawler = crawler
+                logger.info("AdaptiveCrawler browser started")
+            return self._crawler
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=self._settings.crawler_timeout / 1000,
+                follow_redirects=True,
+                headers={"User-Agent": _HTTP_USER_AGENT},
+                limits=httpx.Limits(max_keepalive_connections=20),
+            )
+        return self._http_client
+
+    def _schedule_counter_flush(self) -> None:
+        if self._counter_flush_task is None or self._counter_flush_task.done():
+            self._counter_flush_task = asyncio.create_task(self._counter_flush_loop())
+
+    async def _counter_flush_loop(self) -> None:
+        while self._config_manager.has_pending_counters:
+            await asyncio.sleep(_COUNTER_FLUSH_INTERVAL_SECONDS)
+            await self._flush_counters()
+
+    async def _flush_counters(self) -> None:
+        try:
+            await asyncio.to_thread(self._config_manager.flush_counters)
+        except Exception as e:
+            logger.warning(f"Failed to flush site config counters: {e}")
+
+    async def close(self) -> None:
+        if self._counter_flush_task is not None:
+            self._counter_flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._counter_flush_task
+            self._counter_flush_task = None
+        await self._flush_counters()
+
+        async with self._crawler_lock:
+            if self._crawler is not None:
+                await self._crawler.close()
+                self._crawler = None
+                logger.info("AdaptiveCrawler browser closed")
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def _fetch_html_fast(self, url: str, max_bytes: int = 0) -> str | None:
+        """Plain HTTP GET for pages whose HTML is served without JavaScript.
+
+        With max_bytes set, reading stops once that many bytes arrived and
+        only that prefix is decoded.
+        """
+        try:
+            async with self._get_http_client().stream("GET", url) as response:
+                content_type = response.headers.get("content-type", "")
+                if response.is_error or "html" not in content_type:
+                    return None
+
+                chunks: list[bytes] = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if max_bytes and size >= max_bytes:
+                        break
+                encoding = response.charset_encoding or "utf-8"
+        except httpx.HTTPError as e:
+            logger.debug(f"HTTP fetch failed for {url}: {e}")
+            return None
+
+        body = b"".join(chunks)
+        if max_bytes:
+            body = body[:max_bytes]
+        try:
+            return body.decode(encoding, errors="ignore") or None
+        except LookupError:
+            return body.decode("utf-8", errors="ignore") or None
+
+    async def _fetch_html_browser(self, url: str) -> str:
+        crawler = await self._ensure_crawler()
+        raw_result = await crawler.arun(url=url, config=self._raw_fetch_config)
+        return getattr(raw_result, "html", "")
+
+    async def _fetch_analysis_html(self, url: str) -> str:
+        max_chars = self._crawler_config.adaptive.max_analysis_chars
+        html = await self._fetch_html_fast(url, max_chars * _ANALYSIS_BYTES_PER_CHAR)
+        if html:
+            prepared, text_chars = self._prepare_html_for_analysis(html, max_chars)
+            if text_chars >= _MIN_ANALYSIS_TEXT_CHARS:
+                return prepared
+            logger.debug(f"Only {text_chars} chars of text in {url}, rendering it")
+
+        html = await self._fetch_html_browser(url)
+        prepared, _ = self._prepare_html_for_analysis(html, max_chars)
+        return prepared
+
+    @staticmethod
+    def _prepare_html_for_analysis(html: str, max_chars: int) -> tuple[str, int]:
+        """Drop script/style/svg subtrees and cap the size sent to the analyzer.
+
+        Document order keeps <head> and the top of <body> within the cap.
+        Also returns the length of the page's visible text.
+        """
+        if not html:
+            return html, 0
+
+        try:
+            tree = parse_html_document(html)
+            etree.strip_elements(tree, *_ANALYSIS_STRIP_TAGS, with_tail=False)
+            text_chars = len(_element_text(tree))
+            prepared = lxml_html.tostring(tree, encoding="unicode")
+        except Exception as e:
+            logger.debug(f"Could not pre-clean HTML for analysis: {e}")
+            prepared = html
+            text_chars = len(html)
+
+        prepared = " ".join(prepared.split())
+        if max_chars and len(prepared) > max_chars:
+            prepared = prepared[:max_chars]
+        return prepared, text_chars
+
+    def update_config(self, crawler_config: CrawlerConfig) -> None:
+        """Apply freshly loaded settings without restarting the browser."""
+        if crawler_config == self._crawler_config:
+            return
+        if (
+            crawler_config.adaptive.max_concurrency
+            != self._crawler_config.adaptive.max_concurrency
+        ):
+            self._crawl_limiter.set_limit(
+                crawler_config.adaptive.max_concurrency or 64
+            )
+        self._crawler_config = crawler_config
+        self._analyzer = get_page_analyzer(crawler_config.llm)
+        self._validator = get_content_validator(crawler_config.adaptive)
+
+    async def _get_config_for_url(self, url: str) -> SiteConfig | None:
+        # ConfigManager caches per domain and hands out a fresh copy each call,
+        # so callers may tweak the returned config without affecting others
+        return await asyncio.to_thread(self._config_manager.get_config_for_url, url)
+
+    def invalidate_config_cache(self, domain: str | None = None) -> None:
+        """Drop cached site configs for one domain, or for all domains."""
+        self._config_manager.invalidate_cache(domain)
+
+    async def _save_config(self, config: SiteConfig) -> str:
+        config_id = await asyncio.to_thread(self._config_manager.save_config, config)
+        self.invalidate_config_cache(config.domain)
+        return config_id
+
+    async def _record_success(self, config_id: str | None) -> None:
+        if config_id:
+            self._config_manager.record_success(config_id)
+            self._schedule_counter_flush()
+
+    async def _record_failure(self, config: SiteConfig) -> None:
+        if config.id:
+            self._config_manager.record_failure(config.id)
+            self._schedule_counter_flush()
+        self.invalidate_config_cache(config.domain)
 
     async def crawl_single_url(
         self,
@@ -79,12 +358,8 @@ class AdaptiveCrawler:
         excluded_selector: str | None = None,
         force_reanalyze: bool = False,
     ) -> tuple[CrawlResult, SiteConfig | None, bool]:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            _executor,
-            partial(
-                _run_in_new_loop,
-                self._do_crawl_single,
+        async with self._crawl_limiter:
+            return await self._do_crawl_single(
                 url,
                 extraction_mode,
                 user_prompt,
@@ -93,8 +368,7 @@ class AdaptiveCrawler:
                 css_selector,
                 excluded_selector,
                 force_reanalyze,
-            ),
-        )
+            )
 
     async def crawl_full_site(
         self,
@@ -108,37 +382,32 @@ class AdaptiveCrawler:
         css_selector: str | None = None,
         excluded_selector: str | None = None,
         force_reanalyze: bool = False,
-        on_page_crawled: Any | None = None,
         job_id: str | None = None,
     ) -> AsyncGenerator[tuple[CrawlResult, SiteConfig | None], None]:
         logger.info(
             f"crawl_full_site starting: url={url}, max_pages={max_pages}, job_id={job_id}"
         )
-        loop = asyncio.get_event_loop()
+        pages = self._do_crawl_full_site(
+            url,
+            max_depth,
+            max_pages,
+            extraction_mode,
+            user_prompt,
+            user_id,
+            preset,
+            css_selector,
+            excluded_selector,
+            force_reanalyze,
+            job_id,
+        )
         try:
-            results = await loop.run_in_executor(
-                _executor,
-                partial(
-                    _run_in_new_loop,
-                    self._do_crawl_full_site,
-                    url,
-                    max_depth,
-                    max_pages,
-                    extraction_mode,
-                    user_prompt,
-                    user_id,
-                    preset,
-                    css_selector,
-                    excluded_selector,
-                    force_reanalyze,
-                    on_page_crawled,
-                    job_id,
-                ),
-            )
-            logger.info(f"crawl_full_site got {len(results) if results else 0} results")
-            for result, config in results:
-                logger.info(f"Yielding result: {result.url}")
-                yield result, config
+            # aclosing() stops the underlying crawl stream as soon as the
+            # consumer breaks out, rather than when the generator is GC'd.
+            async with aclosing(pages):
+                async for result, config in pages:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Yielding result: {result.url}")
+                    yield result, config
         except Exception as e:
             logger.error(f"crawl_full_site error: {e}", exc_info=True)
             raise
@@ -148,15 +417,9 @@ class AdaptiveCrawler:
         url: str,
         user_prompt: str | None = None,
     ) -> AnalysisResult:
-        async with AsyncWebCrawler(config=self._browser_config) as crawler:
-            run_config = CrawlerRunConfig(
-                wait_until=self._settings.crawler_wait_until,
-                page_timeout=self._settings.crawler_timeout,
-            )
-            raw_result = await crawler.arun(url=url, config=run_config)
-            html = raw_result.html if hasattr(raw_result, "html") else ""
-
-        return await self._analyzer.analyze(html, user_prompt)
+        async with self._crawl_limiter:
+            html = await self._fetch_analysis_html(url)
+            return await self._analyzer.analyze(html, user_prompt)
 
     async def _do_crawl_single(
         self,
@@ -169,7 +432,7 @@ class AdaptiveCrawler:
         excluded_selector: str | None,
         force_reanalyze: bool,
     ) -> tuple[CrawlResult, SiteConfig | None, bool]:
-        parsed = urlparse(url)
+        parsed = _cached_urlparse(url)
         domain = parsed.netloc
 
         if extraction_mode == ExtractionMode.MANUAL:
@@ -182,7 +445,7 @@ class AdaptiveCrawler:
 
         existing_config = None
         if not force_reanalyze:
-            existing_config = self._config_manager.get_config_for_url(url)
+            existing_config = await self._get_config_for_url(url)
 
         if (
             existing_config
@@ -195,17 +458,19 @@ class AdaptiveCrawler:
             result, validation = await self._crawl_with_config(url, existing_config)
 
             if validation.is_valid:
-                self._config_manager.record_success(existing_config.id)  # type: ignore
+                await self._record_success(existing_config.id)
                 return result, existing_config, True
 
             logger.warning(f"Cached config failed: {validation.message}")
-            self._config_manager.record_failure(existing_config.id)  # type: ignore
+            await self._record_failure(existing_config)
             return await self._crawl_with_retry(
                 url, existing_config, validation, user_prompt, user_id
             )
 
         logger.info(f"No valid cached config, analyzing {url}")
-        return await self._crawl_with_analysis(url, user_prompt, user_id)
+        return await self._crawl_with_analysis(
+            url, user_prompt, user_id, use_cache=not force_reanalyze
+        )
 
     async def _do_crawl_full_site(
         self,
@@ -219,9 +484,8 @@ class AdaptiveCrawler:
         css_selector: str | None,
         excluded_selector: str | None,
         force_reanalyze: bool,
-        on_page_crawled: Any | None = None,
         job_id: str | None = None,
-    ) -> list[tuple[CrawlResult, SiteConfig | None]]:
+    ) -> AsyncGenerator[tuple[CrawlResult, SiteConfig | None], None]:
         config = await self._resolve_config(
             url,
             extraction_mode,
@@ -243,49 +507,47 @@ class AdaptiveCrawler:
             stream=True,
         )
 
-        results: list[tuple[CrawlResult, SiteConfig | None]] = []
-        title_selector = config.title_selector if config else None
+        title_selectors = _compile_title_selectors(
+            config.title_selector if config else None
+        )
         page_count = 0
-        job_manager = get_job_manager() if job_id else None
+        yielded_count = 0
+        cancel_event = get_job_manager().get_cancel_event(job_id) if job_id else None
+
+        crawler = await self._ensure_crawler()
+        async for raw_result in await crawler.arun(url=url, config=run_config):
+            if cancel_event is not None and cancel_event.is_set():
+                logger.info(f"[Job {job_id}] Crawl cancelled, stopping iteration")
+                break
+
+            page_count += 1
+            success = getattr(raw_result, "success", False)
+            if page_count <= 3 or page_count % _PAGE_LOG_INTERVAL == 0:
+                log_level = logging.INFO
+            else:
+                log_level = logging.DEBUG
+            if logger.isEnabledFor(log_level):
+                result_url = getattr(raw_result, "url", "unknown")
+                logger.log(
+                    log_level,
+                    f"[STREAM] Page {page_count}: url={result_url}, success={success}",
+                )
 
-        async with AsyncWebCrawler(config=self._browser_config) as crawler:
-            async for raw_result in await crawler.arun(url=url, config=run_config):
-                if job_id and job_manager and job_manager.should_stop(job_id):
-                    logger.info(f"[Job {job_id}] Crawl cancelled, stopping iteration")
-                    break
+            if not success:
+                error = getattr(raw_result, "error_message", "unknown error")
+                logger.warning(f"[STREAM] Page {page_count} failed: {error}")
+                continue
 
-                page_count += 1
-                result_url = getattr(raw_result, "url", "unknown")
-                success = getattr(raw_result, "success", False)
-                logger.info(
-                    f"[STREAM] Page {page_count}: url={result_url}, success={success}"
+            async with self._crawl_limiter:
+                html = getattr(raw_result, "html", None)
+                result = self._build_crawl_result(
+                    raw_result, html=html, title_selectors=title_selectors
                 )
 
-                if success:
-                    html = raw_result.html if hasattr(raw_result, "html") else None
-                    result = self._build_crawl_result(
-                        raw_result, html=html, title_selector=title_selector
-                    )
-
-                    if on_page_crawled:
-                        try:
-                            callback_result = on_page_crawled(result, config)
-                            if callback_result:
-                                results.append((result, config))
-                            logger.info(
-                                f"[STREAM] Page {page_count} saved via callback"
-                            )
-                        except Exception as e:
-                            logger.error(f"on_page_crawled callback error: {e}")
-                            results.append((result, config))
-                    else:
-                        results.append((result, config))
-                else:
-                    error = getattr(raw_result, "error_message", "unknown error")
-                    logger.warning(f"[STREAM] Page {page_count} failed: {error}")
-
-        logger.info(f"Crawl complete. Total pages processed: {len(results)}")
-        return results
+            yielded_count += 1
+            yield result, config
+
+        logger.info(f"Crawl complete. Total pages processed: {yielded_count}")
 
     async def _resolve_config(
         self,
@@ -298,9 +560,11 @@ class AdaptiveCrawler:
         excluded_selector: str | None,
         force_reanalyze: bool,
     ) -> SiteConfig | None:
+        parsed = _cached_urlparse(url)
+
         if extraction_mode == ExtractionMode.MANUAL:
             return SiteConfig(
-                domain=urlparse(url).netloc,
+                domain=parsed.netloc,
                 path_pattern="*",
                 css_selector=css_selector,
                 excluded_selector=excluded_selector,
@@ -310,7 +574,7 @@ class AdaptiveCrawler:
             preset_data = get_framework_preset(preset)
             if preset_data:
                 return SiteConfig(
-                    domain=urlparse(url).netloc,
+                    domain=parsed.netloc,
                     path_pattern="*",
                     css_selector=preset_data["css_selector"],
                     excluded_selector=preset_data["excluded_selector"],
@@ -319,24 +583,68 @@ class AdaptiveCrawler:
                 )
 
         if not force_reanalyze:
-            existing = self._config_manager.get_config_for_url(url)
+            existing = await self._get_config_for_url(url)
             if (
                 existing
                 and existing.confidence >= self._crawler_config.adaptive.min_confidence
             ):
                 return existing
 
-        async with AsyncWebCrawler(config=self._browser_config) as crawler:
-            run_config = CrawlerRunConfig(
-                wait_until=self._settings.crawler_wait_until,
-                page_timeout=self._settings.crawler_timeout,
-            )
-            raw_result = await crawler.arun(url=url, config=run_config)
-            html = raw_result.html if hasattr(raw_result, "html") else ""
+        analysis = await self._analyze_url(
+            url, user_prompt, use_cache=not force_reanalyze
+        )
+        return await self._persist_analyzed_config(url, analysis, user_prompt, user_id)
 
-        analysis = await self._analyzer.analyze(html, user_prompt)
-        parsed = urlparse(url)
+    async def _analyze_url(
+        self,
+        url: str,
+        user_prompt: str | None,
+        use_cache: bool = True,
+    ) -> AnalysisResult:
+        """Analyze a page, reusing a proven config from the same domain first.
+
+        Sibling sections of a documentation site almost always share one
+        layout, so a config that keeps validating elsewhere on the domain
+        avoids both the page fetch and the LLM call. use_cache=False skips
+        both the learned config and the analyzer's cached results.
+        """
+        if use_cache:
+            learned = await self._get_learned_config(url, user_prompt)
+            if learned is not None:
+                logger.info(f"Reusing learned config {learned.path_pattern} for {url}")
+                return AnalysisResult(
+                    css_selector=learned.css_selector,
+                    excluded_selector=learned.excluded_selector,
+                    title_selector=learned.title_selector,
+                    framework_detected=learned.framework_detected,
+                    confidence=learned.confidence,
+                    reasoning="Cached site config",
+                )
+
+        html = await self._fetch_analysis_html(url)
+        return await self._analyzer.analyze(html, user_prompt, use_cache=use_cache)
+
+    async def _get_learned_config(
+        self, url: str, user_prompt: str | None
+    ) -> SiteConfig | None:
+        learned = await asyncio.to_thread(
+            self._config_manager.get_learned_config,
+            _cached_urlparse(url).netloc,
+            self._crawler_config.adaptive.min_confidence,
+        )
+        # A config learned for a different extraction goal does not apply
+        if learned is None or (user_prompt and learned.analysis_prompt != user_prompt):
+            return None
+        return learned
 
+    async def _persist_analyzed_config(
+        self,
+        url: str,
+        analysis: AnalysisResult,
+        user_prompt: str | None,
+        user_id: str | None,
+    ) -> SiteConfig:
+        parsed = _cached_urlparse(url)
         new_config = SiteConfig(
             domain=parsed.netloc,
             path_pattern=ConfigManager.extract_path_pattern(parsed.path),
@@ -350,9 +658,7 @@ class AdaptiveCrawler:
             created_by=user_id,
         )
 
-        config_id = self._config_manager.save_config(new_config)
-        new_config.id = config_id
-
+        new_config.id = await self._save_config(new_config)
         return new_config
 
     async def _crawl_with_config(
@@ -362,63 +668,47 @@ class AdaptiveCrawler:
     ) -> tuple[CrawlResult, ValidationResult]:
         run_config = self._build_run_config(config)
 
-        async with AsyncWebCrawler(config=self._browser_config) as crawler:
-            raw_result = await crawler.arun(url=url, config=run_config)
+        crawler = await self._ensure_crawler()
+        raw_result = await crawler.arun(url=url, config=run_config)
 
-            markdown = raw_result.markdown if hasattr(raw_result, "markdown") else ""
-            validation = self._validator.validate(markdown)
+        markdown = getattr(raw_result, "markdown", "")
+        validation = self._validator.validate(markdown)
 
-            html = raw_result.html if hasattr(raw_result, "html") else None
-            result = self._build_crawl_result(
-                raw_result,
-                html=html,
-                title_selector=config.title_selector if config else None,
-            )
-            return result, validation
+        html = getattr(raw_result, "html", None)
+        result = self._build_crawl_result(
+            raw_result,
+            html=html,
+            title_selectors=_compile_title_selectors(
+                config.title_selector if config else None
+            ),
+        )
+        return result, validation
 
     async def _crawl_with_analysis(
         self,
         url: str,
         user_prompt: str | None,
         user_id: str | None,
+        use_cache: bool = True,
     ) -> tuple[CrawlResult, SiteConfig | None, bool]:
-        async with AsyncWebCrawler(config=self._browser_config) as crawler:
-            run_config = CrawlerRunConfig(
-                wait_until=self._settings.crawler_wait_until,
-                page_timeout=self._settings.crawler_timeout,
-            )
-            raw_result = await crawler.arun(url=url, config=run_config)
-            html = raw_result.html if hasattr(raw_result, "html") else ""
-
-        analysis = await self._analyzer.analyze(html, user_prompt)
+        analysis = await self._analyze_url(url, user_prompt, use_cache)
         logger.info(
             f"AI analysis: framework={analysis.framework_detected}, confidence={analysis.confidence}"
         )
 
-        parsed = urlparse(url)
-        new_config = SiteConfig(
-            domain=parsed.netloc,
-            path_pattern=ConfigManager.extract_path_pattern(parsed.path),
-            css_selector=analysis.css_selector,
-            excluded_selector=analysis.excluded_selector,
-            title_selector=analysis.title_selector,
-            framework_detected=analysis.framework_detected,
-            confidence=analysis.confidence,
-            analysis_prompt=user_prompt,
-            sample_url=url,
-            created_by=user_id,
+        new_config = await self._persist_analyzed_config(
+            url, analysis, user_prompt, user_id
         )
 
-        config_id = self._config_manager.save_config(new_config)
-        new_config.id = config_id
-
         result, validation = await self._crawl_with_config(url, new_config)
 
         if validation.is_valid:
-            self._config_manager.record_success(config_id)
+            await self._record_success(new_config.id)
             return result, new_config, False
 
-        self._config_manager.record_failure(config_id)
+        await self._record_failure(new_config)
+        # Don't hand the same selectors to the next page with this structure
+        self._analyzer.discard_analysis(analysis)
         return await self._crawl_with_retry(
             url, new_config, validation, user_prompt, user_id
         )
@@ -434,47 +724,34 @@ class AdaptiveCrawler:
     ) -> tuple[CrawlResult, SiteConfig | None, bool]:
         max_retry = self._crawler_config.adaptive.max_retry
 
-        if retry_count >= max_retry:
-            logger.warning(
-                f"Max retries ({max_retry}) reached, falling back to raw crawl"
-            )
-            return await self._crawl_raw(url)
-
-        logger.info(f"Re-analyzing page (retry {retry_count + 1}/{max_retry})")
+        while retry_count < max_retry:
+            logger.info(f"Re-analyzing page (retry {retry_count + 1}/{max_retry})")
 
-        async with AsyncWebCrawler(config=self._browser_config) as crawler:
-            run_config = CrawlerRunConfig(
-                wait_until=self._settings.crawler_wait_until,
-                page_timeout=self._settings.crawler_timeout,
-            )
-            raw_result = await crawler.arun(url=url, config=run_config)
-            html = raw_result.html if hasattr(raw_result, "html") else ""
+            html = await self._fetch_analysis_html(url)
 
-        failure_reason = self._validator.get_failure_reason(validation)
-        analysis = await self._analyzer.reanalyze(html, old_config, failure_reason)
+            failure_reason = self._validator.get_failure_reason(validation)
+            analysis = await self._analyzer.reanalyze(html, old_config, failure_reason)
 
-        old_config.css_selector = analysis.css_selector
-        old_config.excluded_selector = analysis.excluded_selector
-        old_config.title_selector = analysis.title_selector
-        old_config.confidence = analysis.confidence
-        old_config.framework_detected = analysis.framework_detected
+            old_config.css_selector = analysis.css_selector
+            old_config.excluded_selector = analysis.excluded_selector
+            old_config.title_selector = analysis.title_selector
+            old_config.confidence = analysis.confidence
+            old_config.framework_detected = analysis.framework_detected
 
-        if old_config.id:
-            self._config_manager.save_config(old_config)
+            if old_config.id:
+                await self._save_config(old_config)
 
-        result, new_validation = await self._crawl_with_config(url, old_config)
+            result, validation = await self._crawl_with_config(url, old_config)
 
-        if new_validation.is_valid:
-            if old_config.id:
-                self._config_manager.record_success(old_config.id)
-            return result, old_config, False
+            if validation.is_valid:
+                await self._record_success(old_config.id)
+                return result, old_config, False
 
-        if old_config.id:
-            self._config_manager.record_failure(old_config.id)
+            await self._record_failure(old_config)
+            retry_count += 1
 
-        return await self._crawl_with_retry(
-            url, old_config, new_validation, user_prompt, user_id, retry_count + 1
-        )
+        logger.warning(f"Max retries ({max_retry}) reached, falling back to raw crawl")
+        return await self._crawl_raw(url)
 
     async def _crawl_with_manual_config(
         self,
@@ -483,7 +760,7 @@ class AdaptiveCrawler:
         excluded_selector: str | None,
     ) -> tuple[CrawlResult, SiteConfig | None, bool]:
         config = SiteConfig(
-            domain=urlparse(url).netloc,
+            domain=_cached_urlparse(url).netloc,
             path_pattern="*",
             css_selector=css_selector,
             excluded_selector=excluded_selector,
@@ -504,7 +781,7 @@ class AdaptiveCrawler:
             preset_data = FRAMEWORK_PRESETS["generic"]
 
         config = SiteConfig(
-            domain=urlparse(url).netloc,
+            domain=_cached_urlparse(url).netloc,
             path_pattern="*",
             css_selector=preset_data["css_selector"],
             excluded_selector=preset_data["excluded_selector"],
@@ -525,14 +802,14 @@ class AdaptiveCrawler:
             excluded_tags=["script", "style", "noscript", "iframe"],
         )
 
-        async with AsyncWebCrawler(config=self._browser_config) as crawler:
-            raw_result = await crawler.arun(url=url, config=run_config)
-            html = raw_result.html if hasattr(raw_result, "html") else None
-            result = self._build_crawl_result(
-                raw_result, html=html, title_selector="h1"
-            )
-            result.metadata["extraction_mode"] = "raw_fallback"
-            return result, None, False
+        crawler = await self._ensure_crawler()
+        raw_result = await crawler.arun(url=url, config=run_config)
+        html = getattr(raw_result, "html", None)
+        result = self._build_crawl_result(
+            raw_result, html=html, title_selectors=_compile_title_selectors("h1")
+        )
+        result.metadata["extraction_mode"] = "raw_fallback"
+        return result, None, False
 
     def _build_run_config(
         self,
@@ -540,6 +817,22 @@ class AdaptiveCrawler:
         deep_crawl_strategy: BFSDeepCrawlStrategy | None = None,
         stream: bool = False,
     ) -> CrawlerRunConfig:
+        # Deep-crawl strategies carry per-crawl state, so only the plain
+        # single-page configs are reused. Keying on the selector values (not
+        # the SiteConfig identity) means retries that rewrite the selectors
+        # get a fresh config without explicit invalidation.
+        cache_key: tuple[Any, ...] | None = None
+        if deep_crawl_strategy is None:
+            cache_key = (
+                stream,
+                config.css_selector if config else None,
+                config.excluded_selector if config else None,
+                tuple(config.excluded_tags) if config and config.excluded_tags else (),
+            )
+            cached = self._run_config_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         kwargs: dict[str, Any] = {
             "wait_until": self._settings.crawler_wait_until,
             "page_timeout": self._settings.crawler_timeout,
@@ -557,35 +850,41 @@ class AdaptiveCrawler:
         if deep_crawl_strategy:
             kwargs["deep_crawl_strategy"] = deep_crawl_strategy
 
-        return CrawlerRunConfig(**kwargs)
+        run_config = CrawlerRunConfig(**kwargs)
+        if cache_key is not None:
+            self._run_config_cache[cache_key] = run_config
+        return run_config
 
     @staticmethod
     def _extract_title_from_html(
         html: str | None,
-        title_selector: str | None,
+        title_selectors: tuple[CSSSelector, ...],
     ) -> str | None:
         if not html:
             return None
 
+        # Without custom selectors only <title>/<h1> can match, so skip the
+        # parse entirely for pages that contain neither.
+        if not title_selectors and not _TITLE_TAG_PROBE.search(html):
+            return None
+
         try:
-            soup = BeautifulSoup(html, "html.parser")
+            tree = parse_html_document(html)
 
-            if title_selector:
-                for selector in title_selector.split(","):
-                    selector = selector.strip()
-                    if selector:
-                        element = soup.select_one(selector)
-                        if element:
-                            title = element.get_text(strip=True)
-                            if title:
-                                return title
+            for selector in title_selectors:
+                elements = selector(tree)
+                if elements:
+                    title = _element_text(elements[0])
+                    if title:
+                        return title
 
-            if soup.title and soup.title.string:
-                return soup.title.string.strip()
+            title_element = tree.find(".//title")
+            if title_element is not None and title_element.text:
+                return title_element.text.strip()
 
-            h1 = soup.find("h1")
-            if h1:
-                return h1.get_text(strip=True)
+            h1 = tree.find(".//h1")
+            if h1 is not None:
+                return _element_text(h1)
 
         except Exception:
             pass
@@ -596,24 +895,24 @@ class AdaptiveCrawler:
     def _build_crawl_result(
         raw_result: Any,
         html: str | None = None,
-        title_selector: str | None = None,
+        title_selectors: tuple[CSSSelector, ...] = (),
     ) -> CrawlResult:
-        metadata = raw_result.metadata if hasattr(raw_result, "metadata") else {}
+        metadata = getattr(raw_result, "metadata", {})
         if metadata is None:
             metadata = {}
 
         title = metadata.get("title") if isinstance(metadata, dict) else None
 
         if not title:
-            raw_html = html or (
-                raw_result.html if hasattr(raw_result, "html") else None
+            raw_html = html if html is not None else getattr(raw_result, "html", None)
+            title = AdaptiveCrawler._extract_title_from_html(
+                raw_html, title_selectors
             )
-            title = AdaptiveCrawler._extract_title_from_html(raw_html, title_selector)
 
         return CrawlResult(
-            url=raw_result.url if hasattr(raw_result, "url") else "",
+            url=getattr(raw_result, "url", ""),
             title=title,
-            content=raw_result.markdown if hasattr(raw_result, "markdown") else "",
+            content=getattr(raw_result, "markdown", ""),
             parent_url=getattr(raw_result, "parent_url", None),
             depth=getattr(raw_result, "depth", 0),
             metadata={
@@ -623,15 +922,42 @@ class AdaptiveCrawler:
                 "keywords": metadata.get("keywords")
                 if isinstance(metadata, dict)
                 else None,
-                "status_code": raw_result.status_code
-                if hasattr(raw_result, "status_code")
-                else None,
+                "status_code": getattr(raw_result, "status_code", None),
             },
-            crawled_at=datetime.utcnow(),
+            crawled_at=datetime.now(_UTC),
         )
 
 
+_analyzers: LRUCache[tuple[Any, ...], PageAnalyzer] = LRUCache(maxsize=8)
+_validators: LRUCache[tuple[Any, ...], ContentValidator] = LRUCache(maxsize=8)
+_helpers_lock = Lock()
+
+
+def get_page_analyzer(llm_settings: LLMSettings) -> PageAnalyzer:
+    """Share one PageAnalyzer (and its analysis cache) per LLM configuration."""
+    key = astuple(llm_settings)
+    with _helpers_lock:
+        analyzer = _analyzers.get(key)
+        if analyzer is None:
+            analyzer = _analyzers[key] = PageAnalyzer(llm_settings)
+        return analyzer
+
+
+def get_content_validator(adaptive_settings: AdaptiveSettings) -> ContentValidator:
+    key = astuple(adaptive_settings)
+    with _helpers_lock:
+        validator = _validators.get(key)
+        if validator is None:
+            validator = _validators[key] = ContentValidator(adaptive_settings)
+        return validator
+
+
 _adaptive_crawler: AdaptiveCrawler | None = None
+_adaptive_crawler_lock = Lock()
+# Keeps replaced crawlers referenced until their close() has finished
+_closing_tasks: set[asyncio.Task[None]] = set()
+# Crawlers replaced outside a running loop, closed by close_adaptive_crawler
+_replaced_crawlers: list[AdaptiveCrawler] = []
 
 
 def get_adaptive_crawler(
@@ -639,7 +965,54 @@ def get_adaptive_crawler(
     settings: Settings,
     crawler_config: CrawlerConfig,
 ) -> AdaptiveCrawler:
+    """Return the shared AdaptiveCrawler for the service's Supabase client.
+
+    The service uses a single client, so this normally builds one crawler.
+    A call with a different client replaces it and closes the old browser.
+    """
+    global _adaptive_crawler
+    with _adaptive_crawler_lock:
+        replaced = None
+        if _adaptive_crawler is not None and _adaptive_crawler._client is not client:
+            replaced = _adaptive_crawler
+            _adaptive_crawler = None
+
+        if _adaptive_crawler is None:
+            _adaptive_crawler = AdaptiveCrawler(client, settings, crawler_config)
+        else:
+            _adaptive_crawler.update_config(crawler_config)
+        crawler = _adaptive_crawler
+
+    if replaced is not None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            with _adaptive_crawler_lock:
+                _replaced_crawlers.append(replaced)
+        else:
+            task = loop.create_task(replaced.close())
+            _closing_tasks.add(task)
+            task.add_done_callback(_closing_tasks.discard)
+    return crawler
+
+
+def invalidate_site_config_cache(domain: str | None = None) -> None:
+    """Drop site configs cached by the shared AdaptiveCrawler, if one exists."""
+    with _adaptive_crawler_lock:
+        crawler = _adaptive_crawler
+    if crawler is not None:
+        crawler.invalidate_config_cache(domain)
+
+
+async def close_adaptive_crawler() -> None:
     global _adaptive_crawler
-    if _adaptive_crawler is None:
-        _adaptive_crawler = AdaptiveCrawler(client, settings, crawler_config)
-    return _adaptive_crawler
+    with _adaptive_crawler_lock:
+        crawlers = [*_replaced_crawlers, _adaptive_crawler]
+        _replaced_crawlers.clear()
+        _adaptive_crawler = None
+
+    if _closing_tasks:
+        await asyncio.gather(*_closing_tasks, return_exceptions=True)
+    for crawler in crawlers:
+        if crawler is not None:
+            await crawler.close()
@@ -1,11 +1,21 @@
 """AI-powered page structure analyzer for adaptive crawling."""
 
+import asyncio
+import hashlib
 import json
 import logging
+import random
 import re
-from typing import Any
-
-from litellm import completion, get_model_info, ModelResponse
+from dataclasses import replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from cachetools import LRUCache, TTLCache
+from lxml import etree
+from lxml import html as lxml_html
+from litellm import acompletion, get_model_info, ModelResponse
+from litellm.exceptions import APIConnectionError, RateLimitError, Timeout
 from litellm.types.utils import Choices
 
 from app.models import AnalysisResult, SiteConfig, FRAMEWORK_PRESETS
@@ -70,18 +80,18 @@ Content Selection Guidelines:
 4. Prefer more specific selectors over generic ones
 5. Consider multiple fallback selectors separated by commas"""
 
-ANALYSIS_USER_PROMPT = """Analyze this webpage and identify the main content area.
+# Fixed instructions come first so providers can reuse the cached prompt
+# prefix; per-request values follow.
+ANALYSIS_USER_PROMPT = """Analyze this webpage and identify the main content area. Return ONLY the JSON object, nothing else.
 
 User's extraction goal: {user_prompt}
 
 HTML Structure:
 ```html
 {html}
-```
-
-Return ONLY the JSON object, nothing else."""
+```"""
 
-REANALYSIS_USER_PROMPT = """The previous configuration failed. Please re-analyze and provide better selectors.
+REANALYSIS_USER_PROMPT = """The previous configuration failed. Please re-analyze and provide more robust selectors that handle this page structure. Return ONLY the JSON object.
 
 Failure reason: {failure_reason}
 
@@ -92,9 +102,178 @@ Previous configuration that failed:
 Updated HTML Structure:
 ```html
 {html}
-```
+```"""
+
+
+# Number of LLM analysis results kept in memory per analyzer
+ANALYSIS_CACHE_SIZE = 256
+# Page structure of a site rarely changes within a week
+ANALYSIS_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+# Cleaned HTML kept for recently seen pages (analyze -> reanalyze reuse)
+PREPARED_HTML_CACHE_SIZE = 32
+
+# Transient LLM errors are retried with exponential backoff before falling back
+LLM_MAX_ATTEMPTS = 3
+LLM_RETRY_BASE_DELAY = 1.0
+LLM_RETRY_MAX_DELAY = 10.0
+# Upper bound on a provider-supplied Retry-After we are willing to wait
+LLM_RETRY_AFTER_LIMIT = 60.0
+_RETRYABLE_LLM_ERRORS = (RateLimitError, APIConnectionError, Timeout)
+
+# Text between tags; removing it leaves the tag skeleton that drives selectors
+_TEXT_NODES_PATTERN = re.compile(r">[^<]+<")
+
+# Elements whose content is noise for structure analysis (tags are kept)
+_EMPTIED_TAGS = frozenset({"script", "style"})
+
+# lxml rejects str input that carries an encoding declaration (XHTML pages)
+_XML_DECLARATION_PATTERN = re.compile(r"\A[\ufeff\s]*<\?xml[^>]*\?>")
+
+# Markdown code fence an LLM may wrap its JSON answer in
+_CODE_FENCE_PATTERN = re.compile(r"\A```[\w-]*\n?|\n?```\Z")
+_JSON_DECODER = json.JSONDecoder()
+
+# Markers used by the fallback analysis, as (indicator, framework) pairs.
+# Earlier frameworks win when a page matches several.
+_FRAMEWORK_INDICATORS: tuple[tuple[str, str], ...] = (
+    ("docusaurus", "docusaurus"),
+    ("theme-doc-markdown", "docusaurus"),
+    ("__docusaurus", "docusaurus"),
+    ("gitbook", "gitbook"),
+    ("book-summary", "gitbook"),
+    ("vuepress", "vuepress"),
+    ("theme-default-content", "vuepress"),
+    ("mkdocs", "mkdocs"),
+    ("md-content", "mkdocs"),
+    ("sphinx", "sphinx"),
+    ("sphinxsidebar", "sphinx"),
+    ("readthedocs", "readthedocs"),
+    ("rst-content", "readthedocs"),
+    ("confluence", "confluence"),
+    ("wiki-content", "confluence"),
+    ("notion-page-content", "notion"),
+)
+_INDICATOR_FRAMEWORK: Mapping[str, str] = MappingProxyType(dict(_FRAMEWORK_INDICATORS))
+_FRAMEWORK_RANK: Mapping[str, int] = MappingProxyType(
+    {
+        framework: rank
+        for rank, framework in enumerate(dict.fromkeys(_INDICATOR_FRAMEWORK.values()))
+    }
+)
+# All indicators in one alternation so the page is scanned once, case-insensitively
+_FRAMEWORK_INDICATOR_PATTERN = re.compile(
+    "|".join(
+        re.escape(indicator)
+        for indicator in sorted(_INDICATOR_FRAMEWORK, key=len, reverse=True)
+    ),
+    re.IGNORECASE,
+)
+
+
+class _RequestRateLimiter:
+    """Spaces out requests so no more than `per_minute` start each minute."""
+
+    def __init__(self, per_minute: int) -> None:
+        self._interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def _llm_retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying, honouring a Retry-After header."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        try:
+            retry_after = float(headers.get("retry-after", ""))
+            return max(0.0, min(retry_after, LLM_RETRY_AFTER_LIMIT))
+        except ValueError:
+            pass
+    delay = min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    return delay + random.uniform(0, LLM_RETRY_BASE_DELAY)
+
+
+def parse_html_document(html: str) -> Any:
+    """Parse an HTML string with lxml, tolerating a leading XML declaration."""
+    return lxml_html.document_fromstring(
+        _XML_DECLARATION_PATTERN.sub("", html, count=1)
+    )
+
+
+def _clean_html(html: str) -> str:
+    """Empty script/style, drop comments and style/data-* attributes.
+
+    The document is parsed once and serialized once instead of being
+    rewritten by a chain of regex substitutions over the full string.
+    """
+    try:
+        tree = parse_html_document(html)
+    except (etree.ParserError, ValueError):
+        return " ".join(html.split())
+
+    comments = []
+    for el in tree.iter():
+        if not isinstance(el.tag, str):
+            comments.append(el)
+            continue
+        if el.tag in _EMPTIED_TAGS:
+            el.attrib.clear()
+            el.text = None
+            for child in list(el):
+                el.remove(child)
+            continue
+        for name in el.attrib.keys():
+            if name == "style" or name.startswith("data-"):
+                del el.attrib[name]
+
+    for comment in comments:
+        comment.drop_tree()
+
+    return " ".join(lxml_html.tostring(tree, encoding="unicode").split())
+
+
+@lru_cache(maxsize=64)
+def _model_max_input_tokens(model_name: str) -> int:
+    """Get max input tokens for the model, with fallback defaults."""
+    default_limit = 8000  # Conservative default
+
+    # Extract base model name (remove provider prefix like "openai/")
+    base_model = model_name.split("/")[-1] if "/" in model_name else model_name
+
+    # Check custom model limits first (for models not in litellm)
+    if base_model in CUSTOM_MODEL_LIMITS:
+        limit = CUSTOM_MODEL_LIMITS[base_model]
+        logger.info(
+            f"Model {model_name} max_input_tokens: {limit} (from custom mapping)"
+        )
+        return limit
+
+    # Try litellm's model info
+    try:
+        info = get_model_info(model_name)
+        max_input = info.get("max_input_tokens") or info.get("max_tokens")
+        if max_input is not None:
+            logger.info(
+                f"Model {model_name} max_input_tokens: {max_input} (from litellm)"
+            )
+            return int(max_input)
+    except Exception as e:
+        logger.debug(f"litellm.get_model_info failed for {model_name}: {e}")
 
-Provide more robust selectors that handle this page structure. Return ONLY the JSON object."""
+    logger.warning(
+        f"No token limit found for {model_name}, using default {default_limit}"
+    )
+    return default_limit
 
 
 class PageAnalyzer:
@@ -105,40 +284,63 @@ class PageAnalyzer:
         self._api_base = llm_settings.base_url or None
         self._temperature = llm_settings.temperature
         self._max_tokens = llm_settings.max_tokens
-        self._max_input_tokens = self._get_model_max_input_tokens()
-
-    def _get_model_max_input_tokens(self) -> int:
-        """Get max input tokens for the model, with fallback defaults."""
-        default_limit = 8000  # Conservative default
-        model_name = self._model
-
-        # Extract base model name (remove provider prefix like "openai/")
-        base_model = model_name.split("/")[-1] if "/" in model_name else model_name
-
-        # Check custom model limits first (for models not in litellm)
-        if base_model in CUSTOM_MODEL_LIMITS:
-            limit = CUSTOM_MODEL_LIMITS[base_model]
-            logger.info(
-                f"Model {model_name} max_input_tokens: {limit} (from custom mapping)"
-            )
-            return limit
+        self._max_input_tokens = _model_max_input_tokens(self._model)
+        self._max_html_chars = self._calculate_max_html_chars()
+        self._analysis_cache: TTLCache[tuple[str, ...], AnalysisResult] = TTLCache(
+            maxsize=ANALYSIS_CACHE_SIZE, ttl=ANALYSIS_CACHE_TTL_SECONDS
+        )
+        self._prepared_html: LRUCache[tuple[int, int], str] = LRUCache(
+            maxsize=PREPARED_HTML_CACHE_SIZE
+        )
+        self._system_message = self._build_system_message()
+        # Bounds in-flight LLM requests to stay under provider rate limits
+        self._llm_semaphore = asyncio.Semaphore(llm_settings.max_concurrency or 8)
+        self._rate_limiter = _RequestRateLimiter(llm_settings.requests_per_minute)
 
-        # Try litellm's model info
-        try:
-            info = get_model_info(model_name)
-            max_input = info.get("max_input_tokens") or info.get("max_tokens")
-            if max_input is not None:
-                logger.info(
-                    f"Model {model_name} max_input_tokens: {max_input} (from litellm)"
-                )
-                return int(max_input)
-        except Exception as e:
-            logger.debug(f"litellm.get_model_info failed for {model_name}: {e}")
+    def _build_system_message(self) -> dict[str, Any]:
+        """Build the static system message, marked cacheable where supported.
 
-        logger.warning(
-            f"No token limit found for {model_name}, using default {default_limit}"
-        )
-        return default_limit
+        OpenAI-compatible providers cache identical prompt prefixes
+        automatically; Anthropic needs an explicit cache_control breakpoint.
+        """
+        if "anthropic/" in self._model or "claude" in self._model:
+            return {
+                "role": "system",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": SYSTEM_PROMPT,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+            }
+        return {"role": "system", "content": SYSTEM_PROMPT}
+
+    def _prepare(self, html: str) -> str:
+        """Clean and truncate html, reusing the result for identical input.
+
+        A failed analysis is followed by reanalyze on the same page, so the
+        parse and cleanup only need to run once.
+        """
+        key = (len(html), hash(html))
+        prepared = self._prepared_html.get(key)
+        if prepared is None:
+            prepared = self._truncate_html(html, max_chars=self._max_html_chars)
+            self._prepared_html[key] = prepared
+        return prepared
+
+    def _structure_fingerprint(self, truncated_html: str) -> str:
+        """Hash the model plus the tag-only skeleton of the truncated HTML.
+
+        Sibling pages of one site differ mostly in text, so they share a
+        fingerprint and reuse a single LLM analysis.
+        """
+        skeleton = _TEXT_NODES_PATTERN.sub("><", truncated_html)
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(self._model.encode())
+        digest.update(b"|")
+        digest.update(skeleton.encode("utf-8", errors="replace"))
+        return digest.hexdigest()
 
     def _calculate_max_html_chars(self) -> int:
         """Calculate max HTML chars based on model's token limit.
@@ -160,14 +362,30 @@ class PageAnalyzer:
         self,
         html: str,
         user_prompt: str | None = None,
+        use_cache: bool = True,
     ) -> AnalysisResult:
+        """Analyze a page, reusing a cached result for the same page structure.
+
+        With use_cache=False the LLM is always called, and its answer
+        replaces whatever was cached for the structure.
+        """
         if not self._api_key:
             return self._fallback_analysis(html)
 
-        max_chars = self._calculate_max_html_chars()
-        truncated_html = self._truncate_html(html, max_chars=max_chars)
+        truncated_html = self._prepare(html)
+
+        cache_key = (
+            self._structure_fingerprint(truncated_html),
+            user_prompt or "",
+        )
+        if use_cache:
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Reusing cached LLM analysis for matching page structure")
+                return replace(cached)
+
         logger.info(
-            f"HTML truncated to {len(truncated_html)} chars (max: {max_chars}, model limit: {self._max_input_tokens} tokens)"
+            f"HTML truncated to {len(truncated_html)} chars (max: {self._max_html_chars}, model limit: {self._max_input_tokens} tokens)"
         )
         effective_prompt = (
             user_prompt
@@ -181,22 +399,34 @@ class PageAnalyzer:
 
         try:
             response = await self._call_llm(user_message)
-            return self._parse_response(response)
+            result = self._parse_response(response)
         except Exception as e:
             logger.warning(f"LLM analysis failed: {e}, using fallback")
             return self._fallback_analysis(html)
 
+        self._analysis_cache[cache_key] = replace(result)
+        return result
+
+    def discard_analysis(self, result: AnalysisResult) -> None:
+        """Forget cached analyses whose selectors failed validation."""
+        stale = [
+            key for key, cached in self._analysis_cache.items() if cached == result
+        ]
+        for key in stale:
+            self._analysis_cache.pop(key, None)
+
     async def reanalyze(
         self,
         html: str,
         old_config: SiteConfig,
         failure_reason: str,
     ) -> AnalysisResult:
+        # Only runs after the previous selectors failed, so it is never served
+        # from the analysis cache
         if not self._api_key:
             return self._fallback_analysis(html)
 
-        max_chars = self._calculate_max_html_chars()
-        truncated_html = self._truncate_html(html, max_chars=max_chars)
+        truncated_html = self._prepare(html)
 
         user_message = REANALYSIS_USER_PROMPT.format(
             failure_reason=failure_reason,
@@ -209,16 +439,17 @@ class PageAnalyzer:
             response = await self._call_llm(user_message)
             result = self._parse_response(response)
             result.confidence = min(result.confidence, 0.7)
-            return result
         except Exception as e:
             logger.warning(f"LLM re-analysis failed: {e}, using fallback")
             return self._fallback_analysis(html)
 
+        return result
+
     async def _call_llm(self, user_message: str) -> str:
         kwargs: dict[str, Any] = {
             "model": self._model,
             "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT},
+                self._system_message,
                 {"role": "user", "content": user_message},
             ],
             "temperature": self._temperature,
@@ -229,7 +460,23 @@ class PageAnalyzer:
         if self._api_base:
             kwargs["api_base"] = self._api_base
 
-        response = completion(**kwargs)
+        attempt = 1
+        while True:
+            try:
+                async with self._llm_semaphore:
+                    await self._rate_limiter.acquire()
+                    response = await acompletion(**kwargs)
+                break
+            except _RETRYABLE_LLM_ERRORS as e:
+                if attempt >= LLM_MAX_ATTEMPTS:
+                    raise
+                delay = _llm_retry_delay(e, attempt)
+                logger.info(
+                    f"LLM call failed ({type(e).__name__}), "
+                    f"retrying in {delay:.1f}s (attempt {attempt}/{LLM_MAX_ATTEMPTS})"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
 
         # Type guard: completion without stream=True returns ModelResponse
         if not isinstance(response, ModelResponse):
@@ -247,20 +494,13 @@ class PageAnalyzer:
         return content if content else ""
 
     def _parse_response(self, response: str) -> AnalysisResult:
-        cleaned = response.strip()
-        if cleaned.startswith("```"):
-            lines = cleaned.split("\n")
-            cleaned = "\n".join(lines[1:-1] if lines[-1] == "```" else lines[1:])
+        cleaned = _CODE_FENCE_PATTERN.sub("", response.strip())
 
         try:
             data = json.loads(cleaned)
         except json.JSONDecodeError:
-            import re
-
-            json_match = re.search(r"\{[^{}]*\}", cleaned, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-            else:
+            data = self._extract_json_object(cleaned)
+            if data is None:
                 raise ValueError(
                     f"Could not parse LLM response as JSON: {cleaned[:200]}"
                 )
@@ -276,25 +516,32 @@ class PageAnalyzer:
             reasoning=data.get("reasoning"),
         )
 
-    def _fallback_analysis(self, html: str) -> AnalysisResult:
-        html_lower = html.lower()
-
-        framework_indicators = {
-            "docusaurus": ["docusaurus", "theme-doc-markdown", "__docusaurus"],
-            "gitbook": ["gitbook", "book-summary"],
-            "vuepress": ["vuepress", "theme-default-content"],
-            "mkdocs": ["mkdocs", "md-content"],
-            "sphinx": ["sphinx", "sphinxsidebar"],
-            "readthedocs": ["readthedocs", "rst-content"],
-            "confluence": ["confluence", "wiki-content"],
-            "notion": ["notion-page-content"],
-        }
+    @staticmethod
+    def _extract_json_object(text: str) -> dict[str, Any] | None:
+        """Return the first JSON object embedded in surrounding prose.
 
+        Decoding from each "{" handles nested objects and braces inside
+        strings, which a flat regex cannot.
+        """
+        start = text.find("{")
+        while start != -1:
+            try:
+                data, _ = _JSON_DECODER.raw_decode(text, start)
+                return data
+            except json.JSONDecodeError:
+                start = text.find("{", start + 1)
+        return None
+
+    def _fallback_analysis(self, html: str) -> AnalysisResult:
         detected_framework = None
-        for framework, indicators in framework_indicators.items():
-            if any(indicator in html_lower for indicator in indicators):
-                detected_framework = framework
-                break
+        best_rank = len(_FRAMEWORK_RANK)
+        for match in _FRAMEWORK_INDICATOR_PATTERN.finditer(html):
+            framework = _INDICATOR_FRAMEWORK[match.group().lower()]
+            rank = _FRAMEWORK_RANK[framework]
+            if rank < best_rank:
+                detected_framework, best_rank = framework, rank
+                if rank == 0:
+                    break
 
         if detected_framework and detected_framework in FRAMEWORK_PRESETS:
             preset = FRAMEWORK_PRESETS[detected_framework]
@@ -324,41 +571,19 @@ class PageAnalyzer:
         Uses 12000 chars as default (~4000-6000 tokens for mixed content).
         This leaves room for system prompt and response within 30K token limit.
         """
-        # First, clean up the HTML to remove noise
-        cleaned = html
-
-        # Remove script and style content (keep tags for structure analysis)
-        cleaned = re.sub(
-            r"<script[^>]*>[\s\S]*?</script>",
-            "<script></script>",
-            cleaned,
-            flags=re.IGNORECASE,
-        )
-        cleaned = re.sub(
-            r"<style[^>]*>[\s\S]*?</style>",
-            "<style></style>",
-            cleaned,
-            flags=re.IGNORECASE,
-        )
-
-        # Remove comments
-        cleaned = re.sub(r"<!--[\s\S]*?-->", "", cleaned)
-
-        # Remove inline styles and data attributes (keep class for framework detection)
-        cleaned = re.sub(r'\s+style="[^"]*"', "", cleaned)
-        cleaned = re.sub(r'\s+data-[a-z-]+="[^"]*"', "", cleaned, flags=re.IGNORECASE)
-
-        # Collapse multiple whitespaces
-        cleaned = re.sub(r"\s+", " ", cleaned)
+        # First, clean up the HTML to remove noise (keep class for framework
+        # detection and script/style tags for structure analysis)
+        cleaned = _clean_html(html)
 
         if len(cleaned) <= max_chars:
             return cleaned
 
         # Try to preserve head and beginning of body
-        head_end = cleaned.lower().find("</head>")
+        cleaned_lower = cleaned.lower()
+        head_end = cleaned_lower.find("</head>")
         if head_end != -1:
             head_portion = cleaned[: head_end + 7]
-            body_start = cleaned.lower().find("<body", head_end)
+            body_start = cleaned_lower.find("<body", head_end)
             if body_start != -1:
                 remaining = (
                     max_chars - len(head_portion) - 100
@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     crawler_wait_until: str = (
         "domcontentloaded"  # domcontentloaded, load, networkidle, commit
     )
+    # Concurrent crawls handled by the basic CrawlerService
+    crawler_max_concurrency: int = 8
 
     # API settings
     api_host: str = "0.0.0.0"
@@ -1,24 +1,78 @@
 """Site configuration manager for adaptive crawling."""
 
 import fnmatch
+import re
+import threading
+from dataclasses import replace
+from functools import lru_cache
 from typing import Any
 from urllib.parse import urlparse
 
+from cachetools import TTLCache
 from supabase import Client
 
 from app.models import SiteConfig
 
 
+# Configs per domain kept in memory; the TTL bounds staleness from edits
+# made outside this process
+DOMAIN_CACHE_SIZE = 1024
+DOMAIN_CACHE_TTL_SECONDS = 60
+
+# Compiled glob is None for "*", literal paths and "/prefix/*" patterns,
+# which _match_path handles with plain string comparisons
+_CompiledConfig = tuple[str, re.Pattern[str] | None, SiteConfig]
+
+
 class ConfigManager:
     def __init__(self, client: Client) -> None:
         self._client = client
         self._table = "crawl_site_configs"
+        self._domain_cache: TTLCache[str, list[_CompiledConfig]] = TTLCache(
+            maxsize=DOMAIN_CACHE_SIZE, ttl=DOMAIN_CACHE_TTL_SECONDS
+        )
+        # Methods are called from worker threads via asyncio.to_thread
+        self._cache_lock = threading.Lock()
+        # config_id -> [success_delta, failure_delta], sent by flush_counters()
+        self._pending_counters: dict[str, list[int]] = {}
+        self._counters_lock = threading.Lock()
 
     def get_config_for_url(self, url: str) -> SiteConfig | None:
         parsed = urlparse(url)
-        domain = parsed.netloc
         path = parsed.path
 
+        for pattern, compiled, config in self._get_compiled_configs(parsed.netloc):
+            if self._match_path(path, pattern, compiled):
+                return replace(config)
+
+        return None
+
+    def get_learned_config(
+        self, domain: str, min_confidence: float
+    ) -> SiteConfig | None:
+        """Best proven config on a domain, regardless of its path pattern.
+
+        Only configs that succeeded more often than they failed qualify.
+        """
+        best: SiteConfig | None = None
+        for _, _, config in self._get_compiled_configs(domain):
+            if config.success_count <= config.failure_count:
+                continue
+            if config.confidence < min_confidence:
+                continue
+            if best is None or (config.confidence, config.success_count) > (
+                best.confidence,
+                best.success_count,
+            ):
+                best = config
+        return replace(best) if best is not None else None
+
+    def _get_compiled_configs(self, domain: str) -> list[_CompiledConfig]:
+        with self._cache_lock:
+            cached = self._domain_cache.get(domain)
+        if cached is not None:
+            return cached
+
         response = (
             self._client.table(self._table)
             .select("*")
@@ -27,14 +81,24 @@ class ConfigManager:
             .execute()
         )
 
-        if not response.data:
-            return None
-
-        for row in response.data:
-            if self._match_path(path, row.get("path_pattern", "*")):
-                return SiteConfig.from_db_row(row)
-
-        return None
+        compiled_configs: list[_CompiledConfig] = []
+        for row in response.data or []:
+            pattern = row.get("path_pattern", "*")
+            compiled_configs.append(
+                (pattern, self._compile_glob(pattern), SiteConfig.from_db_row(row))
+            )
+
+        with self._cache_lock:
+            self._domain_cache[domain] = compiled_configs
+        return compiled_configs
+
+    def invalidate_cache(self, domain: str | None = None) -> None:
+        """Drop cached configs for one domain, or for all domains."""
+        with self._cache_lock:
+            if domain is None:
+                self._domain_cache.clear()
+            else:
+                self._domain_cache.pop(domain, None)
 
     def get_config_by_id(self, config_id: str) -> SiteConfig | None:
         response = (
@@ -63,39 +127,70 @@ class ConfigManager:
     def save_config(self, config: SiteConfig) -> str:
         data = config.to_db_dict()
 
-        existing = (
+        # (domain, path_pattern) is unique, so one upsert replaces the
+        # select-then-update/insert pair
+        response = (
             self._client.table(self._table)
-            .select("id")
-            .eq("domain", config.domain)
-            .eq("path_pattern", config.path_pattern)
+            .upsert(data, on_conflict="domain,path_pattern")
             .execute()
         )
-
-        if existing.data:
-            config_id = existing.data[0]["id"]
-            self._client.table(self._table).update(data).eq("id", config_id).execute()
-            return str(config_id)
-
-        response = self._client.table(self._table).insert(data).execute()
+        self.invalidate_cache(config.domain)
         return str(response.data[0]["id"])
 
     def update_config(self, config_id: str, **kwargs: Any) -> None:
         self._client.table(self._table).update(kwargs).eq("id", config_id).execute()
+        self.invalidate_cache()
 
     def record_success(self, config_id: str) -> None:
-        self._client.rpc(
-            "increment_site_config_success",
-            {"config_id": config_id},
-        ).execute()
+        """Buffer a success; it reaches the database on the next flush."""
+        self._add_pending(config_id, success=1)
 
     def record_failure(self, config_id: str) -> None:
-        self._client.rpc(
-            "increment_site_config_failure",
-            {"config_id": config_id},
-        ).execute()
+        """Buffer a failure; it reaches the database on the next flush."""
+        self._add_pending(config_id, failure=1)
+
+    @property
+    def has_pending_counters(self) -> bool:
+        return bool(self._pending_counters)
+
+    def _add_pending(self, config_id: str, success: int = 0, failure: int = 0) -> None:
+        with self._counters_lock:
+            deltas = self._pending_counters.setdefault(config_id, [0, 0])
+            deltas[0] += success
+            deltas[1] += failure
+
+    def flush_counters(self) -> int:
+        """Send buffered success/failure counts in a single RPC.
+
+        Returns the number of configs updated. On error the counts are
+        kept for the next flush and the exception is re-raised.
+        """
+        with self._counters_lock:
+            pending = self._pending_counters
+            self._pending_counters = {}
+
+        if not pending:
+            return 0
+
+        updates = [
+            {"id": config_id, "success_delta": success, "failure_delta": failure}
+            for config_id, (success, failure) in pending.items()
+        ]
+        try:
+            self._client.rpc(
+                "increment_site_config_counters",
+                {"updates": updates},
+            ).execute()
+        except Exception:
+            for config_id, (success, failure) in pending.items():
+                self._add_pending(config_id, success, failure)
+            raise
+
+        return len(updates)
 
     def delete_config(self, config_id: str) -> None:
         self._client.table(self._table).delete().eq("id", config_id).execute()
+        self.invalidate_cache()
 
     def list_configs(
         self,
@@ -116,22 +211,34 @@ class ConfigManager:
 
         return configs, total
 
-    def _match_path(self, path: str, pattern: str) -> bool:
+    @staticmethod
+    def _compile_glob(pattern: str) -> re.Pattern[str] | None:
         if pattern == "*":
-            return True
+            return None
 
-        normalized_path = path.rstrip("/")
         normalized_pattern = pattern.rstrip("/")
+        literal = normalized_pattern.removesuffix("/*")
+        if not any(char in literal for char in "*?["):
+            return None
+        return re.compile(fnmatch.translate(normalized_pattern))
 
-        if fnmatch.fnmatch(normalized_path, normalized_pattern):
+    @staticmethod
+    def _match_path(path: str, pattern: str, compiled: re.Pattern[str] | None) -> bool:
+        if pattern == "*":
             return True
 
+        normalized_path = path.rstrip("/")
+        normalized_pattern = pattern.rstrip("/")
+
         if normalized_pattern.endswith("/*"):
-            prefix = normalized_pattern[:-2]
-            if normalized_path.startswith(prefix):
+            # A plain prefix test, as stored configs have always been matched:
+            # "/docs/*" also covers "/docs-v2/..."
+            if normalized_path.startswith(normalized_pattern[:-2]):
                 return True
 
-        return False
+        if compiled is None:
+            return normalized_path == normalized_pattern
+        return compiled.match(normalized_path) is not None
 
     @staticmethod
     def extract_path_pattern(path: str) -> str:
@@ -141,3 +248,9 @@ class ConfigManager:
         if len(parts) == 1 and parts[0]:
             return "/" + parts[0] + "/*"
         return "*"
+
+
+@lru_cache(maxsize=1)
+def get_config_manager(client: Client) -> ConfigManager:
+    """Shared ConfigManager, so every caller sees the same domain cache."""
+    return ConfigManager(client)
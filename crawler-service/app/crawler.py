@@ -1,9 +1,9 @@
 import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
-from functools import partial
-from typing import Any, AsyncGenerator, Callable
+from contextlib import aclosing
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, AsyncGenerator
 
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
@@ -13,16 +13,8 @@ from app.job_manager import get_job_manager
 from app.schemas import CrawlResult
 
 logger = logging.getLogger(__name__)
-_executor = ThreadPoolExecutor(max_workers=4)
 
-
-def _run_in_new_loop(coro_func: Any, *args: Any, **kwargs: Any) -> Any:
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro_func(*args, **kwargs))
-    finally:
-        loop.close()
+_UTC = timezone.utc
 
 
 class CrawlerService:
@@ -32,46 +24,73 @@ class CrawlerService:
             headless=True,
             verbose=False,
         )
-
-    async def _do_crawl_single(self, url: str) -> CrawlResult:
-        config = CrawlerRunConfig(
+        # Single-URL crawls always use the same settings
+        self._single_run_config = CrawlerRunConfig(
             wait_until=self.settings.crawler_wait_until,
             page_timeout=self.settings.crawler_timeout,
         )
+        self._crawl_semaphore = asyncio.Semaphore(
+            self.settings.crawler_max_concurrency or 8
+        )
+        self._crawler: AsyncWebCrawler | None = None
+        self._crawler_lock = asyncio.Lock()
+
+    async def _ensure_crawler(self) -> AsyncWebCrawler:
+        """Start the shared browser on first use and reuse it afterwards."""
+        if self._crawler is not None:
+            return self._crawler
+
+        async with self._crawler_lock:
+            if self._crawler is None:
+                crawler = AsyncWebCrawler(config=self.browser_config)
+                await crawler.start()
+                self._crawler = crawler
+                logger.info("CrawlerService browser started")
+            return self._crawler
+
+    async def close(self) -> None:
+        async with self._crawler_lock:
+            if self._crawler is not None:
+                await self._crawler.close()
+                self._crawler = None
+                logger.info("CrawlerService browser closed")
+
+    @staticmethod
+    def _to_schema(raw: Any) -> CrawlResult:
+        """Convert a crawl4ai result into the service's CrawlResult."""
+        metadata = raw.metadata or {}
+        get = metadata.get
+        return CrawlResult(
+            url=raw.url,
+            title=get("title"),
+            content=raw.markdown or "",
+            parent_url=getattr(raw, "parent_url", None),
+            depth=getattr(raw, "depth", 0),
+            metadata={
+                "description": get("description"),
+                "keywords": get("keywords"),
+                "status_code": raw.status_code,
+            },
+            crawled_at=datetime.now(_UTC),
+        )
 
-        async with AsyncWebCrawler(config=self.browser_config) as crawler:
-            result = await crawler.arun(url=url, config=config)
-
-            metadata = result.metadata or {}
-            return CrawlResult(
-                url=result.url,
-                title=metadata.get("title"),
-                content=result.markdown or "",
-                parent_url=None,
-                depth=0,
-                metadata={
-                    "description": metadata.get("description"),
-                    "keywords": metadata.get("keywords"),
-                    "status_code": result.status_code,
-                },
-                crawled_at=datetime.utcnow(),
-            )
+    async def _do_crawl_single(self, url: str) -> CrawlResult:
+        crawler = await self._ensure_crawler()
+        result = await crawler.arun(url=url, config=self._single_run_config)
+
+        return self._to_schema(result)
 
     async def crawl_single_url(self, url: str) -> CrawlResult:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            _executor,
-            partial(_run_in_new_loop, self._do_crawl_single, url),
-        )
+        async with self._crawl_semaphore:
+            return await self._do_crawl_single(url)
 
     async def _do_crawl_full_site(
         self,
         url: str,
         max_depth: int,
         max_pages: int,
-        on_page_crawled: Callable[[CrawlResult], bool] | None = None,
         job_id: str | None = None,
-    ) -> list[CrawlResult]:
+    ) -> AsyncGenerator[CrawlResult, None]:
         deep_crawl_strategy = BFSDeepCrawlStrategy(
             max_depth=max_depth,
             max_pages=max_pages,
@@ -85,82 +104,44 @@ class CrawlerService:
             stream=True,
         )
 
-        results_list: list[CrawlResult] = []
         page_count = 0
-        job_manager = get_job_manager() if job_id else None
-
-        async with AsyncWebCrawler(config=self.browser_config) as crawler:
-            async for result in await crawler.arun(url=url, config=config):
-                if job_id and job_manager and job_manager.should_stop(job_id):
-                    logger.info(f"[Job {job_id}] Crawl cancelled, stopping iteration")
-                    break
-
-                page_count += 1
-                if result.success:
-                    metadata = result.metadata or {}
-                    crawl_result = CrawlResult(
-                        url=result.url,
-                        title=metadata.get("title"),
-                        content=result.markdown or "",
-                        parent_url=getattr(result, "parent_url", None),
-                        depth=getattr(result, "depth", 0),
-                        metadata={
-                            "description": metadata.get("description"),
-                            "keywords": metadata.get("keywords"),
-                            "status_code": result.status_code,
-                        },
-                        crawled_at=datetime.utcnow(),
-                    )
-
-                    if on_page_crawled:
-                        try:
-                            if on_page_crawled(crawl_result):
-                                results_list.append(crawl_result)
-                            logger.info(
-                                f"[STREAM] Page {page_count} saved via callback"
-                            )
-                        except Exception as e:
-                            logger.error(f"on_page_crawled callback error: {e}")
-                            results_list.append(crawl_result)
-                    else:
-                        results_list.append(crawl_result)
-                else:
-                    logger.warning(
-                        f"[STREAM] Page {page_count} failed: {getattr(result, 'error_message', 'unknown')}"
-                    )
-
-        return results_list
+        cancel_event = get_job_manager().get_cancel_event(job_id) if job_id else None
+
+        crawler = await self._ensure_crawler()
+        async for result in await crawler.arun(url=url, config=config):
+            if cancel_event is not None and cancel_event.is_set():
+                logger.info(f"[Job {job_id}] Crawl cancelled, stopping iteration")
+                break
+
+            page_count += 1
+            if result.success:
+                yield self._to_schema(result)
+            else:
+                logger.warning(
+                    f"[STREAM] Page {page_count} failed: {getattr(result, 'error_message', 'unknown')}"
+                )
 
     async def crawl_full_site(
         self,
         url: str,
         max_depth: int = 3,
         max_pages: int = 100,
-        on_page_crawled: Callable[[CrawlResult], bool] | None = None,
         job_id: str | None = None,
     ) -> AsyncGenerator[CrawlResult, None]:
-        loop = asyncio.get_event_loop()
-        results = await loop.run_in_executor(
-            _executor,
-            partial(
-                _run_in_new_loop,
-                self._do_crawl_full_site,
-                url,
-                max_depth,
-                max_pages,
-                on_page_crawled,
-                job_id,
-            ),
-        )
-        for result in results:
-            yield result
+        pages = self._do_crawl_full_site(url, max_depth, max_pages, job_id)
+        async with self._crawl_semaphore:
+            # aclosing() stops the crawl stream as soon as the consumer breaks out
+            async with aclosing(pages):
+                async for result in pages:
+                    yield result
 
 
-_crawler: CrawlerService | None = None
+@lru_cache
+def get_crawler() -> CrawlerService:
+    return CrawlerService()
 
 
-def get_crawler() -> CrawlerService:
-    global _crawler
-    if _crawler is None:
-        _crawler = CrawlerService()
-    return _crawler
+async def close_crawler() -> None:
+    # Don't build a CrawlerService just to close it
+    if get_crawler.cache_info().currsize:
+        await get_crawler().close()
@@ -2,6 +2,7 @@
 
 import hashlib
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 from supabase import Client, create_client
@@ -20,7 +21,7 @@ class Database:
             settings.supabase_service_role_key,
         )
 
-    def insert_document(
+    def upsert_document(
         self,
         kb_id: str,
         result: CrawlResult,
@@ -28,30 +29,137 @@ class Database:
         user_id: str | None = None,
     ) -> str | None:
         """
-        Insert a crawled document into the database.
+        Upsert a crawled document without reading the existing row first.
 
+        Rows are matched on (kb_id, source_url). Used by the streaming crawl,
+        where a SELECT per page costs more than rewriting an unchanged one.
         Returns the document ID if successful, None otherwise.
         """
         if not user_id:
             raise ValueError("user_id is required for document insertion")
 
-        # Generate content hash for deduplication
-        content_hash = hashlib.sha256(result.content.encode()).hexdigest()
+        response = (
+            self.client.table("documents")
+            .upsert(
+                self._document_row(kb_id, result, source_label, user_id),
+                on_conflict="kb_id,source_url",
+            )
+            .execute()
+        )
+        if response.data:
+            return response.data[0]["id"]
+        return None
+
+    def update_or_insert_document(
+        self,
+        kb_id: str,
+        result: CrawlResult,
+        source_label: str | None = None,
+        user_id: str | None = None,
+    ) -> str | None:
+        """
+        Insert a crawled document, or update the existing one for its URL.
+
+        Unchanged content is not rewritten.
+        Returns the document ID if successful, None otherwise.
+        """
+        if not user_id:
+            raise ValueError("user_id is required for document insertion")
 
         # Check if document with same URL already exists in this KB
         existing = (
             self.client.table("documents")
-            .select("id")
+            .select("id, content_hash")
             .eq("kb_id", kb_id)
             .eq("source_url", str(result.url))
             .execute()
         )
 
+        document_data = self._document_row(kb_id, result, source_label, user_id)
+
+        # Unchanged page: skip rewriting the (large) content column
+        if (
+            existing.data
+            and existing.data[0].get("content_hash") == document_data["content_hash"]
+        ):
+            return existing.data[0]["id"]
+
+        if existing.data:
+            # Update existing document
+            doc_id = existing.data[0]["id"]
+            self.client.table("documents").update(document_data).eq(
+                "id", doc_id
+            ).execute()
+            return doc_id
+        else:
+            # Insert new document
+            response = self.client.table("documents").insert(document_data).execute()
+            if response.data:
+                return response.data[0]["id"]
+            return None
+
+    def insert_documents_batch(
+        self,
+        kb_id: str,
+        results: list[CrawlResult],
+        source_label: str | None = None,
+        user_id: str | None = None,
+    ) -> list[str]:
+        """
+        Upsert several crawled documents in one request.
+
+        Rows are matched on (kb_id, source_url). Returns the document IDs.
+        """
+        if not user_id:
+            raise ValueError("user_id is required for document insertion")
+        if not results:
+            return []
+
+        # A URL may appear twice in one batch; Postgres rejects an upsert that
+        # touches the same row twice, so keep the latest result per URL
+        rows_by_url = {
+            str(result.url): self._document_row(kb_id, result, source_label, user_id)
+            for result in results
+        }
+
+        # Pages whose content hash is unchanged are not rewritten
+        existing = (
+            self.client.table("documents")
+            .select("id, source_url, content_hash")
+            .eq("kb_id", kb_id)
+            .in_("source_url", list(rows_by_url))
+            .execute()
+        )
+        doc_ids: list[str] = []
+        for row in existing.data or []:
+            new_row = rows_by_url.get(row["source_url"])
+            if new_row and new_row["content_hash"] == row.get("content_hash"):
+                doc_ids.append(row["id"])
+                del rows_by_url[row["source_url"]]
+
+        if rows_by_url:
+            response = (
+                self.client.table("documents")
+                .upsert(list(rows_by_url.values()), on_conflict="kb_id,source_url")
+                .execute()
+            )
+            doc_ids.extend(row["id"] for row in response.data or [])
+        return doc_ids
+
+    @staticmethod
+    def _document_row(
+        kb_id: str,
+        result: CrawlResult,
+        source_label: str | None,
+        user_id: str,
+    ) -> dict[str, Any]:
         content = result.content or ""
+        # Generate content hash for deduplication (one UTF-8 encode of the page)
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
         word_count = len(content.split())
         char_count = len(content)
 
-        document_data = {
+        return {
             "kb_id": kb_id,
             "user_id": user_id,
             "title": result.title or "Untitled",
@@ -70,20 +178,6 @@ class Database:
             "metadata": result.metadata,
         }
 
-        if existing.data:
-            # Update existing document
-            doc_id = existing.data[0]["id"]
-            self.client.table("documents").update(document_data).eq(
-                "id", doc_id
-            ).execute()
-            return doc_id
-        else:
-            # Insert new document
-            response = self.client.table("documents").insert(document_data).execute()
-            if response.data:
-                return response.data[0]["id"]
-            return None
-
     def create_crawl_job(
         self,
         url: str,
@@ -130,27 +224,14 @@ class Database:
 
     def increment_kb_document_count(self, kb_id: str, count: int = 1) -> None:
         """Increment the document count for a knowledge base."""
-        # Get current count
-        response = (
-            self.client.table("knowledge_bases")
-            .select("document_count")
-            .eq("id", kb_id)
-            .execute()
-        )
-        if response.data:
-            current_count = response.data[0].get("document_count", 0) or 0
-            self.client.table("knowledge_bases").update(
-                {"document_count": current_count + count}
-            ).eq("id", kb_id).execute()
-
-
-# Singleton instance
-_db: Database | None = None
+        # Single atomic UPDATE in Postgres; no read-modify-write race between jobs
+        self.client.rpc(
+            "increment_document_count",
+            {"kb_id_param": kb_id, "increment_by": count},
+        ).execute()
 
 
+@lru_cache
 def get_database() -> Database:
     """Get database singleton instance."""
-    global _db
-    if _db is None:
-        _db = Database()
-    return _db
+    return Database()
@@ -4,7 +4,7 @@ import asyncio
 import logging
 from dataclasses import dataclass, field
 from enum import Enum
-from threading import Lock
+from functools import lru_cache
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -26,6 +26,7 @@ class JobControl:
     job_id: str
     state: JobState = JobState.RUNNING
     pause_event: asyncio.Event = field(default_factory=asyncio.Event)
+    cancel_event: asyncio.Event = field(default_factory=asyncio.Event)
 
     def __post_init__(self) -> None:
         self.pause_event.set()
@@ -33,63 +34,53 @@ class JobControl:
 
 class JobManager:
     """
-    Singleton manager for tracking and controlling crawl jobs.
+    Manager for tracking and controlling crawl jobs; use get_job_manager().
 
-    Provides thread-safe operations for:
+    Must be used from the event loop thread. Provides operations for:
     - Registering new jobs
     - Checking if a job should stop (cancelled)
     - Pausing and resuming jobs
     - Cleaning up completed jobs
     """
 
-    _instance: "JobManager | None" = None
-    _lock = Lock()
-
-    def __new__(cls) -> "JobManager":
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super().__new__(cls)
-                cls._instance._initialized = False
-            return cls._instance
-
     def __init__(self) -> None:
-        if self._initialized:
-            return
+        # Only touched from the event loop thread, and no method awaits
+        # between reading and updating a job, so no lock is needed
         self._jobs: dict[str, JobControl] = {}
-        self._jobs_lock = Lock()
-        self._initialized = True
+        # Set whenever no job is registered, for wait_until_idle()
+        self._idle = asyncio.Event()
+        self._idle.set()
         logger.info("JobManager initialized")
 
     def register_job(self, job_id: str) -> None:
         """Register a new job for tracking."""
-        with self._jobs_lock:
-            if job_id in self._jobs:
-                logger.warning(f"Job {job_id} already registered, resetting state")
-            self._jobs[job_id] = JobControl(job_id=job_id)
-            logger.info(f"Job {job_id} registered")
+        if job_id in self._jobs:
+            logger.warning(f"Job {job_id} already registered, resetting state")
+        self._jobs[job_id] = JobControl(job_id=job_id)
+        self._idle.clear()
+        logger.info(f"Job {job_id} registered")
 
     def unregister_job(self, job_id: str) -> None:
         """Remove a job from tracking."""
-        with self._jobs_lock:
-            if job_id in self._jobs:
-                del self._jobs[job_id]
-                logger.info(f"Job {job_id} unregistered")
+        if job_id in self._jobs:
+            del self._jobs[job_id]
+            logger.info(f"Job {job_id} unregistered")
+        if not self._jobs:
+            self._idle.set()
 
     def is_job_cancelled(self, job_id: str) -> bool:
         """Check if a job has been cancelled."""
-        with self._jobs_lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                return True
-            return job.state == JobState.CANCELLED
+        job = self._jobs.get(job_id)
+        if job is None:
+            return True
+        return job.state == JobState.CANCELLED
 
     def is_job_paused(self, job_id: str) -> bool:
         """Check if a job is paused."""
-        with self._jobs_lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                return False
-            return job.state == JobState.PAUSED
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        return job.state == JobState.PAUSED
 
     def should_stop(self, job_id: str) -> bool:
         """
@@ -98,79 +89,88 @@ class JobManager:
         """
         return self.is_job_cancelled(job_id)
 
+    def get_cancel_event(self, job_id: str) -> asyncio.Event:
+        """
+        Get the event set when a job is cancelled.
+        Crawl loops fetch it once and poll is_set() per page; an unknown job
+        gets an already-set event, matching should_stop().
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            event = asyncio.Event()
+            event.set()
+            return event
+        return job.cancel_event
+
     def cancel_job(self, job_id: str) -> bool:
         """
         Mark a job as cancelled.
         Returns True if job was found and cancelled, False otherwise.
         """
-        with self._jobs_lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                logger.warning(f"Cannot cancel job {job_id}: not found")
-                return False
-
-            if job.state in (JobState.CANCELLED, JobState.COMPLETED):
-                logger.warning(f"Job {job_id} already in terminal state: {job.state}")
-                return False
-
-            job.state = JobState.CANCELLED
-            job.pause_event.set()
-            logger.info(f"Job {job_id} cancelled")
-            return True
+        job = self._jobs.get(job_id)
+        if job is None:
+            logger.warning(f"Cannot cancel job {job_id}: not found")
+            return False
+
+        if job.state in (JobState.CANCELLED, JobState.COMPLETED):
+            logger.warning(f"Job {job_id} already in terminal state: {job.state}")
+            return False
+
+        job.state = JobState.CANCELLED
+        job.cancel_event.set()
+        job.pause_event.set()
+        logger.info(f"Job {job_id} cancelled")
+        return True
 
     def pause_job(self, job_id: str) -> bool:
         """
         Pause a running job.
         Returns True if job was found and paused, False otherwise.
         """
-        with self._jobs_lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                logger.warning(f"Cannot pause job {job_id}: not found")
-                return False
-
-            if job.state != JobState.RUNNING:
-                logger.warning(f"Cannot pause job {job_id}: state is {job.state}")
-                return False
-
-            job.state = JobState.PAUSED
-            job.pause_event.clear()
-            logger.info(f"Job {job_id} paused")
-            return True
+        job = self._jobs.get(job_id)
+        if job is None:
+            logger.warning(f"Cannot pause job {job_id}: not found")
+            return False
+
+        if job.state != JobState.RUNNING:
+            logger.warning(f"Cannot pause job {job_id}: state is {job.state}")
+            return False
+
+        job.state = JobState.PAUSED
+        job.pause_event.clear()
+        logger.info(f"Job {job_id} paused")
+        return True
 
     def resume_job(self, job_id: str) -> bool:
         """
         Resume a paused job.
         Returns True if job was found and resumed, False otherwise.
         """
-        with self._jobs_lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                logger.warning(f"Cannot resume job {job_id}: not found")
-                return False
-
-            if job.state != JobState.PAUSED:
-                logger.warning(f"Cannot resume job {job_id}: state is {job.state}")
-                return False
-
-            job.state = JobState.RUNNING
-            job.pause_event.set()
-            logger.info(f"Job {job_id} resumed")
-            return True
+        job = self._jobs.get(job_id)
+        if job is None:
+            logger.warning(f"Cannot resume job {job_id}: not found")
+            return False
+
+        if job.state != JobState.PAUSED:
+            logger.warning(f"Cannot resume job {job_id}: state is {job.state}")
+            return False
+
+        job.state = JobState.RUNNING
+        job.pause_event.set()
+        logger.info(f"Job {job_id} resumed")
+        return True
 
     def mark_completed(self, job_id: str) -> None:
         """Mark a job as completed."""
-        with self._jobs_lock:
-            job = self._jobs.get(job_id)
-            if job is not None:
-                job.state = JobState.COMPLETED
-                logger.info(f"Job {job_id} marked as completed")
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.state = JobState.COMPLETED
+            logger.info(f"Job {job_id} marked as completed")
 
     def get_job_state(self, job_id: str) -> JobState | None:
         """Get the current state of a job."""
-        with self._jobs_lock:
-            job = self._jobs.get(job_id)
-            return job.state if job else None
+        job = self._jobs.get(job_id)
+        return job.state if job else None
 
     async def wait_if_paused(self, job_id: str, timeout: float = 1.0) -> bool:
         """
@@ -179,64 +179,62 @@ class JobManager:
         This should be called periodically in the crawl loop.
         Uses timeout to allow periodic cancellation checks.
         """
-        with self._jobs_lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                return False
-            if job.state == JobState.CANCELLED:
-                return False
-            pause_event = job.pause_event
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        if job.state == JobState.CANCELLED:
+            return False
+        pause_event = job.pause_event
+        # Not paused: the common case needs no waiter, task or timer
+        if pause_event.is_set():
+            return True
 
         while True:
             try:
-                await asyncio.wait_for(
-                    asyncio.shield(self._wait_for_event(pause_event)), timeout=timeout
-                )
+                await asyncio.wait_for(pause_event.wait(), timeout=timeout)
                 break
             except asyncio.TimeoutError:
-                with self._jobs_lock:
-                    job = self._jobs.get(job_id)
-                    if job is None or job.state == JobState.CANCELLED:
-                        return False
-                    if job.state != JobState.PAUSED:
-                        break
+                job = self._jobs.get(job_id)
+                if job is None or job.state == JobState.CANCELLED:
+                    return False
+                if job.state != JobState.PAUSED:
+                    break
                 continue
 
         return True
 
-    @staticmethod
-    async def _wait_for_event(event: asyncio.Event) -> None:
-        """Helper to wait for an event."""
-        await event.wait()
+    async def wait_until_idle(self, timeout: float) -> bool:
+        """
+        Wait until every registered job has finished and unregistered.
+        Returns False if jobs were still registered after timeout seconds.
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
 
     def get_active_jobs(self) -> list[str]:
         """Get list of active (running or paused) job IDs."""
-        with self._jobs_lock:
-            return [
-                job_id
-                for job_id, job in self._jobs.items()
-                if job.state in (JobState.RUNNING, JobState.PAUSED)
-            ]
+        return [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.state in (JobState.RUNNING, JobState.PAUSED)
+        ]
 
     def get_job_info(self, job_id: str) -> dict[str, Any] | None:
         """Get information about a job."""
-        with self._jobs_lock:
-            job = self._jobs.get(job_id)
-            if job is None:
-                return None
-            return {
-                "job_id": job.job_id,
-                "state": job.state.value,
-                "is_paused": job.state == JobState.PAUSED,
-            }
-
-
-_job_manager: JobManager | None = None
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        return {
+            "job_id": job.job_id,
+            "state": job.state.value,
+            "is_paused": job.state == JobState.PAUSED,
+        }
 
 
+@lru_cache
 def get_job_manager() -> JobManager:
     """Get the global JobManager instance."""
-    global _job_manager
-    if _job_manager is None:
-        _job_manager = JobManager()
-    return _job_manager
+    return JobManager()
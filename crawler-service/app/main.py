@@ -1,14 +1,14 @@
 import asyncio
 import logging
 import signal
-import sys
-from contextlib import asynccontextmanager
-from datetime import datetime
+import time
+from contextlib import aclosing, asynccontextmanager
+from datetime import datetime, timezone
 from typing import Any, AsyncGenerator
 
 import httpx
 from fastapi import BackgroundTasks, FastAPI, HTTPException, Query
-from supabase import create_client
+from supabase import Client
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,21 +18,17 @@ logging.getLogger("playwright").setLevel(logging.WARNING)
 logging.getLogger("crawl4ai").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
-
-def _handle_exit(signum: int, frame: Any) -> None:
-    logger.info("Shutting down gracefully...")
-    sys.exit(0)
-
-
-signal.signal(signal.SIGINT, _handle_exit)
-signal.signal(signal.SIGTERM, _handle_exit)
-
-from app.adaptive_crawler import AdaptiveCrawler
-from app.config import Settings, get_settings
-from app.config_manager import ConfigManager
-from app.crawler import get_crawler
+from app.adaptive_crawler import (
+    close_adaptive_crawler,
+    get_adaptive_crawler,
+    invalidate_site_config_cache,
+)
+from app.config import get_settings
+from app.config_manager import get_config_manager
+from app.crawler import close_crawler, get_crawler
 from app.database import get_database
 from app.job_manager import get_job_manager
+from app.models import SiteConfig
 from app.schemas import (
     AnalyzeRequest,
     AnalyzeResponse,
@@ -40,6 +36,7 @@ from app.schemas import (
     CrawlJobStatus,
     CrawlMode,
     CrawlRequest,
+    CrawlResult,
     CrawlStatus,
     CrawlSyncResponse,
     ExtractionMode,
@@ -48,16 +45,105 @@ from app.schemas import (
     SiteConfigResponse,
     WebhookPayload,
 )
-from app.settings_loader import SettingsLoader, CrawlerConfig
+from app.settings_loader import CrawlerConfig, get_settings_loader
+
+# Crawled pages written to Supabase per upsert request
+DOCUMENT_BATCH_SIZE = 50
+# A partial batch is written after this long without new pages
+DOCUMENT_FLUSH_SECONDS = 0.5
+# Pages buffered between the crawl stream and the database writer
+PAGE_QUEUE_SIZE = 200
+# Minimum gap between crawl_jobs progress writes; final states always write
+PROGRESS_UPDATE_SECONDS = 1.0
+
+# Completion webhooks are retried on connection errors and 5xx responses
+WEBHOOK_MAX_ATTEMPTS = 3
+WEBHOOK_RETRY_BASE_DELAY = 0.5
+
+# Longest a shutdown signal waits for running crawls to save their pages
+SHUTDOWN_DRAIN_SECONDS = 25.0
+
+# Strong references to in-flight webhook deliveries so they aren't collected
+_webhook_tasks: set[asyncio.Task[None]] = set()
+_shutdown_task: asyncio.Task[None] | None = None
+
+
+def _get_supabase_client() -> Client:
+    # One client (and HTTP connection pool) for the whole service; also keeps
+    # get_adaptive_crawler returning the same crawler/browser.
+    return get_database().client
+
 
+async def _get_crawler_config() -> CrawlerConfig:
+    # Shared loader: system_settings is re-read at most once per TTL, in a
+    # worker thread since the reload is a blocking Supabase query
+    loader = get_settings_loader(_get_supabase_client())
+    config = loader.cached_crawler_config()
+    if config is None:
+        config = await asyncio.to_thread(loader.get_crawler_config)
+    return config
 
-def _get_supabase_client(settings: Settings) -> Any:
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+
+def _utc_now_iso() -> str:
+    """Timestamp for crawl_jobs columns; utcnow() is deprecated and naive."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _cancel_active_jobs() -> None:
+    job_manager = get_job_manager()
+    for job_id in job_manager.get_active_jobs():
+        job_manager.cancel_job(job_id)
+
+
+async def _graceful_shutdown(app: FastAPI, signum: int, previous: Any) -> None:
+    logger.info("Shutting down gracefully...")
+    # Running crawls stop at the next page, flush their document buffers and
+    # are marked cancelled instead of being left "running"
+    _cancel_active_jobs()
+    if not await get_job_manager().wait_until_idle(SHUTDOWN_DRAIN_SECONDS):
+        logger.warning("Crawl jobs were still saving pages at shutdown")
+    if _webhook_tasks:
+        await asyncio.gather(*_webhook_tasks, return_exceptions=True)
+    await app.state.http_client.aclose()
+
+    if callable(previous):
+        # Hand over to uvicorn's handler so the server itself stops
+        previous(signum, None)
+    else:
+        # Not under a server that handles the signal: restore the default
+        # disposition and deliver it again now that cleanup is done
+        asyncio.get_running_loop().remove_signal_handler(signum)
+        signal.raise_signal(signum)
+
+
+def _handle_exit(app: FastAPI, signum: int, previous: Any) -> None:
+    global _shutdown_task
+    if _shutdown_task is None:
+        _shutdown_task = asyncio.create_task(
+            _graceful_shutdown(app, signum, previous)
+        )
+    elif callable(previous):
+        # A second signal skips the wait, like uvicorn's forced exit
+        previous(signum, None)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, _handle_exit, app, sig, signal.getsignal(sig))
+
+    # Shared by all webhook deliveries so connections are kept alive
+    app.state.http_client = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
     yield
+    if _webhook_tasks:
+        await asyncio.gather(*_webhook_tasks, return_exceptions=True)
+    await app.state.http_client.aclose()
+    await close_adaptive_crawler()
+    await close_crawler()
 
 
 app = FastAPI(
@@ -86,10 +172,9 @@ async def crawl_single_url_sync(request: CrawlRequest) -> CrawlSyncResponse:
     try:
         if request.use_ai:
             settings = get_settings()
-            client = _get_supabase_client(settings)
-            settings_loader = SettingsLoader(client)
-            crawler_config = settings_loader.get_crawler_config()
-            adaptive_crawler = AdaptiveCrawler(client, settings, crawler_config)
+            client = _get_supabase_client()
+            crawler_config = await _get_crawler_config()
+            adaptive_crawler = get_adaptive_crawler(client, settings, crawler_config)
 
             result, config, used_cache = await adaptive_crawler.crawl_single_url(
                 url=str(request.url),
@@ -102,7 +187,7 @@ async def crawl_single_url_sync(request: CrawlRequest) -> CrawlSyncResponse:
                 force_reanalyze=request.force_reanalyze,
             )
 
-            doc_id = db.insert_document(
+            doc_id = db.update_or_insert_document(
                 kb_id=request.kb_id,
                 result=result,
                 source_label=request.source_label,
@@ -127,7 +212,7 @@ async def crawl_single_url_sync(request: CrawlRequest) -> CrawlSyncResponse:
             crawler = get_crawler()
             result = await crawler.crawl_single_url(str(request.url))
 
-            doc_id = db.insert_document(
+            doc_id = db.update_or_insert_document(
                 kb_id=request.kb_id,
                 result=result,
                 source_label=request.source_label,
@@ -153,6 +238,15 @@ async def crawl_single_url_sync(request: CrawlRequest) -> CrawlSyncResponse:
         )
 
 
+async def _without_config(
+    pages: AsyncGenerator[CrawlResult, None],
+) -> AsyncGenerator[tuple[CrawlResult, None], None]:
+    """Yield the basic crawler's pages as (result, None) like the adaptive one."""
+    async with aclosing(pages):
+        async for result in pages:
+            yield result, None
+
+
 async def execute_full_site_crawl(
     job_id: str,
     url: str,
@@ -162,6 +256,7 @@ async def execute_full_site_crawl(
     max_depth: int,
     max_pages: int,
     webhook_url: str | None,
+    http_client: httpx.AsyncClient,
     use_ai: bool,
     extraction_mode: ExtractionMode,
     extraction_prompt: str | None,
@@ -190,7 +285,7 @@ async def execute_full_site_crawl(
             job_id,
             status="failed",
             error=error_message,
-            completed_at=datetime.utcnow().isoformat(),
+            completed_at=_utc_now_iso(),
         )
         job_manager.unregister_job(job_id)
         return
@@ -202,7 +297,7 @@ async def execute_full_site_crawl(
             job_id,
             status="failed",
             error=error_message,
-            completed_at=datetime.utcnow().isoformat(),
+            completed_at=_utc_now_iso(),
         )
         job_manager.unregister_job(job_id)
         return
@@ -212,62 +307,109 @@ async def execute_full_site_crawl(
     )
     db.update_crawl_job(job_id, status="running")
 
-    try:
-        if use_ai:
-            settings = get_settings()
-            client = _get_supabase_client(settings)
-            settings_loader = SettingsLoader(client)
-            crawler_config = settings_loader.get_crawler_config()
-            adaptive_crawler = AdaptiveCrawler(client, settings, crawler_config)
-
-            logger.info(f"[Job {job_id}] Using adaptive AI crawler")
+    page_queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=PAGE_QUEUE_SIZE)
+    pages_done = object()
+    last_progress_update = 0.0
 
-            def save_page_callback(result: Any, config: Any) -> bool:
-                nonlocal pages_crawled, config_id, framework_detected
-
-                if job_manager.should_stop(job_id):
-                    logger.info(f"[Job {job_id}] Cancelled, skipping page save")
-                    return False
-
-                if config and not config_id:
-                    config_id = config.id
-                    framework_detected = config.framework_detected
-                    logger.info(
-                        f"[Job {job_id}] Framework detected: {framework_detected}"
-                    )
+    async def save_batch(batch: list[Any]) -> None:
+        nonlocal pages_crawled, last_progress_update
+        if not batch:
+            return
 
+        try:
+            doc_ids = await asyncio.to_thread(
+                db.insert_documents_batch,
+                kb_id=kb_id,
+                results=batch,
+                source_label=source_label,
+                user_id=user_id,
+            )
+        except Exception as batch_error:
+            logger.warning(
+                f"[Job {job_id}] Batch insert failed ({batch_error}), saving pages one by one"
+            )
+            doc_ids = []
+            for result in batch:
                 try:
-                    doc_id = db.insert_document(
+                    doc_id = await asyncio.to_thread(
+                        db.upsert_document,
                         kb_id=kb_id,
                         result=result,
                         source_label=source_label,
                         user_id=user_id,
                     )
-
-                    if doc_id:
-                        document_ids.append(doc_id)
-                        pages_crawled += 1
-                        logger.info(
-                            f"[Job {job_id}] Page {pages_crawled} saved: {result.url}"
-                        )
-                        db.update_crawl_job(
-                            job_id,
-                            pages_crawled=pages_crawled,
-                            progress=min(int((pages_crawled / max_pages) * 100), 99),
-                        )
-                        return True
-                    else:
-                        logger.warning(
-                            f"[Job {job_id}] Failed to insert document for {result.url}"
-                        )
-                        return False
                 except Exception as insert_error:
                     logger.error(
                         f"[Job {job_id}] Error inserting document for {result.url}: {insert_error}"
                     )
-                    return False
+                    continue
+                if doc_id:
+                    doc_ids.append(doc_id)
+
+        document_ids.extend(doc_ids)
+        pages_crawled += len(doc_ids)
+        logger.info(f"[Job {job_id}] Saved {len(doc_ids)} pages ({pages_crawled} total)")
+
+        now = time.monotonic()
+        if now - last_progress_update < PROGRESS_UPDATE_SECONDS:
+            return
+        last_progress_update = now
+        try:
+            await asyncio.to_thread(
+                db.update_crawl_job,
+                job_id,
+                pages_crawled=pages_crawled,
+                progress=min(int((pages_crawled / max_pages) * 100), 99),
+            )
+        except Exception as progress_error:
+            logger.warning(f"[Job {job_id}] Failed to update progress: {progress_error}")
+
+    async def consume_pages() -> None:
+        # Writes overlap with crawling; the bounded queue applies backpressure
+        batch: list[Any] = []
+        while True:
+            try:
+                item = await asyncio.wait_for(
+                    page_queue.get(), DOCUMENT_FLUSH_SECONDS if batch else None
+                )
+            except asyncio.TimeoutError:
+                await save_batch(batch)
+                batch = []
+                continue
+
+            if item is pages_done:
+                await save_batch(batch)
+                return
+
+            batch.append(item)
+            if len(batch) >= DOCUMENT_BATCH_SIZE:
+                await save_batch(batch)
+                batch = []
+
+    async def crawl_pages() -> None:
+        nonlocal was_cancelled, config_id, framework_detected
+        cancel_event = job_manager.get_cancel_event(job_id)
+        # BFS can reach a page twice (e.g. with and without a trailing slash);
+        # only the first copy is saved and counted
+        seen_urls: set[str] = set()
+
+        def is_new_page(result: Any) -> bool:
+            page_url = str(result.url).rstrip("/")
+            if page_url in seen_urls:
+                return False
+            seen_urls.add(page_url)
+            return True
+
+        pages: AsyncGenerator[tuple[CrawlResult, SiteConfig | None], None]
+        if use_ai:
+            settings = get_settings()
+            client = _get_supabase_client()
+            crawler_config = await _get_crawler_config()
+            adaptive_crawler = get_adaptive_crawler(client, settings, crawler_config)
+
+            logger.info(f"[Job {job_id}] Using adaptive AI crawler")
 
-            async for result, config in adaptive_crawler.crawl_full_site(
+            pages = adaptive_crawler.crawl_full_site(
                 url=url,
                 max_depth=max_depth,
                 max_pages=max_pages,
@@ -278,66 +420,51 @@ async def execute_full_site_crawl(
                 css_selector=css_selector,
                 excluded_selector=excluded_selector,
                 force_reanalyze=force_reanalyze,
-                on_page_crawled=save_page_callback,
                 job_id=job_id,
-            ):
-                if job_manager.should_stop(job_id):
-                    logger.info(f"[Job {job_id}] Cancelled during crawl iteration")
-                    was_cancelled = True
-                    break
+            )
         else:
             crawler = get_crawler()
             logger.info(f"[Job {job_id}] Using basic crawler")
 
-            def save_basic_page_callback(result: Any) -> bool:
-                nonlocal pages_crawled
+            pages = _without_config(
+                crawler.crawl_full_site(
+                    url=url,
+                    max_depth=max_depth,
+                    max_pages=max_pages,
+                    job_id=job_id,
+                )
+            )
 
-                if job_manager.should_stop(job_id):
-                    logger.info(f"[Job {job_id}] Cancelled, skipping page save")
-                    return False
+        async with aclosing(pages):
+            async for result, config in pages:
+                if cancel_event.is_set():
+                    logger.info(f"[Job {job_id}] Cancelled during crawl iteration")
+                    was_cancelled = True
+                    break
 
-                try:
-                    doc_id = db.insert_document(
-                        kb_id=kb_id,
-                        result=result,
-                        source_label=source_label,
-                        user_id=user_id,
+                if config and not config_id:
+                    config_id = config.id
+                    framework_detected = config.framework_detected
+                    logger.info(
+                        f"[Job {job_id}] Framework detected: {framework_detected}"
                     )
 
-                    if doc_id:
-                        document_ids.append(doc_id)
-                        pages_crawled += 1
-                        logger.info(
-                            f"[Job {job_id}] Page {pages_crawled} saved: {result.url}"
-                        )
-                        db.update_crawl_job(
-                            job_id,
-                            pages_crawled=pages_crawled,
-                            progress=min(int((pages_crawled / max_pages) * 100), 99),
-                        )
-                        return True
-                    else:
-                        logger.warning(
-                            f"[Job {job_id}] Failed to insert document for {result.url}"
-                        )
-                        return False
-                except Exception as insert_error:
-                    logger.error(
-                        f"[Job {job_id}] Error inserting document for {result.url}: {insert_error}"
-                    )
-                    return False
+                if is_new_page(result):
+                    await page_queue.put(result)
 
-            async for result in crawler.crawl_full_site(
-                url=url,
-                max_depth=max_depth,
-                max_pages=max_pages,
-                on_page_crawled=save_basic_page_callback,
-                job_id=job_id,
-            ):
-                if job_manager.should_stop(job_id):
-                    logger.info(f"[Job {job_id}] Cancelled during crawl iteration")
-                    was_cancelled = True
-                    break
+        # The crawl streams also watch cancel_event and may end on their own
+        # without yielding again, so the loop above never sees the cancel
+        was_cancelled = was_cancelled or cancel_event.is_set()
+
+    try:
+        consumer = asyncio.create_task(consume_pages())
+        try:
+            await crawl_pages()
+        finally:
+            # Pages crawled before a cancel or error are still saved
+            if not consumer.done():
+                await page_queue.put(pages_done)
+            await consumer
 
         if pages_crawled > 0:
             db.increment_kb_document_count(kb_id, count=pages_crawled)
@@ -348,7 +475,7 @@ async def execute_full_site_crawl(
                 job_id,
                 status="cancelled",
                 pages_crawled=pages_crawled,
-                completed_at=datetime.utcnow().isoformat(),
+                completed_at=_utc_now_iso(),
             )
         else:
             logger.info(f"[Job {job_id}] Crawl completed: {pages_crawled} pages")
@@ -357,7 +484,7 @@ async def execute_full_site_crawl(
                 status="completed",
                 progress=100,
                 pages_crawled=pages_crawled,
-                completed_at=datetime.utcnow().isoformat(),
+                completed_at=_utc_now_iso(),
             )
 
         job_manager.mark_completed(job_id)
@@ -371,7 +498,7 @@ async def execute_full_site_crawl(
             status="failed",
             error=error_message,
             pages_crawled=pages_crawled,
-            completed_at=datetime.utcnow().isoformat(),
+            completed_at=_utc_now_iso(),
         )
     finally:
         job_manager.unregister_job(job_id)
@@ -388,12 +515,49 @@ async def execute_full_site_crawl(
             framework_detected=framework_detected,
         )
 
+        # A slow webhook endpoint shouldn't hold up the background task
+        body = payload.model_dump_json().encode()
+        task = asyncio.create_task(
+            _send_webhook(http_client, job_id, webhook_url, body)
+        )
+        _webhook_tasks.add(task)
+        task.add_done_callback(_webhook_tasks.discard)
+
+
+async def _send_webhook(
+    http_client: httpx.AsyncClient,
+    job_id: str,
+    webhook_url: str,
+    body: bytes,
+) -> None:
+    for attempt in range(1, WEBHOOK_MAX_ATTEMPTS + 1):
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                await client.post(webhook_url, json=payload.model_dump())
-                logger.info(f"[Job {job_id}] Webhook sent successfully")
+            # Serialized by pydantic's JSON encoder, so httpx doesn't re-encode
+            response = await http_client.post(
+                webhook_url,
+                content=body,
+                headers={"content-type": "application/json"},
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as webhook_error:
+            # Connection errors and 5xx are transient; a 4xx won't change
+            retryable = (
+                not isinstance(webhook_error, httpx.HTTPStatusError)
+                or webhook_error.response.status_code >= 500
+            )
+            if not retryable or attempt == WEBHOOK_MAX_ATTEMPTS:
+                logger.warning(
+                    f"[Job {job_id}] Failed to send webhook "
+                    f"(attempt {attempt}): {webhook_error}"
+                )
+                return
+            await asyncio.sleep(WEBHOOK_RETRY_BASE_DELAY * 2 ** (attempt - 1))
         except Exception as webhook_error:
             logger.warning(f"[Job {job_id}] Failed to send webhook: {webhook_error}")
+            return
+        else:
+            logger.info(f"[Job {job_id}] Webhook sent successfully")
+            return
 
 
 @app.post("/crawl/async", response_model=CrawlJobResponse)
@@ -426,6 +590,7 @@ async def crawl_full_site_async(
         max_depth=request.max_depth,
         max_pages=request.max_pages,
         webhook_url=webhook,
+        http_client=app.state.http_client,
         use_ai=request.use_ai,
         extraction_mode=request.extraction_mode,
         extraction_prompt=request.extraction_prompt,
@@ -482,11 +647,14 @@ async def cancel_crawl_job(job_id: str) -> JobControlResponse:
     job_manager = get_job_manager()
     cancelled = job_manager.cancel_job(job_id)
 
-    db.update_crawl_job(
-        job_id,
-        status="cancelled",
-        completed_at=datetime.utcnow().isoformat(),
-    )
+    # A job running here records its own cancelled status (with the final
+    # page count) once it stops; only orphaned jobs need the write
+    if not cancelled:
+        db.update_crawl_job(
+            job_id,
+            status="cancelled",
+            completed_at=_utc_now_iso(),
+        )
 
     logger.info(f"Job {job_id} cancel requested, manager_cancelled={cancelled}")
 
@@ -563,9 +731,8 @@ async def resume_crawl_job(job_id: str) -> JobControlResponse:
 @app.post("/analyze", response_model=AnalyzeResponse)
 async def analyze_page_structure(request: AnalyzeRequest) -> AnalyzeResponse:
     settings = get_settings()
-    client = _get_supabase_client(settings)
-    settings_loader = SettingsLoader(client)
-    crawler_config = settings_loader.get_crawler_config()
+    client = _get_supabase_client()
+    crawler_config = await _get_crawler_config()
 
     if not crawler_config.llm.enabled:
         raise HTTPException(
@@ -573,7 +740,7 @@ async def analyze_page_structure(request: AnalyzeRequest) -> AnalyzeResponse:
             detail="LLM not configured. Configure LLM settings in system_settings.",
         )
 
-    adaptive_crawler = AdaptiveCrawler(client, settings, crawler_config)
+    adaptive_crawler = get_adaptive_crawler(client, settings, crawler_config)
 
     try:
         result = await adaptive_crawler.analyze_page(
@@ -603,9 +770,8 @@ async def list_site_configs(
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
 ) -> SiteConfigListResponse:
-    settings = get_settings()
-    client = _get_supabase_client(settings)
-    config_manager = ConfigManager(client)
+    client = _get_supabase_client()
+    config_manager = get_config_manager(client)
 
     configs, total = config_manager.list_configs(
         limit=limit,
@@ -613,6 +779,8 @@ async def list_site_configs(
         domain=domain,
     )
 
+    # Fallback for rows missing timestamps, computed once per listing
+    now = datetime.now(timezone.utc)
     return SiteConfigListResponse(
         configs=[
             SiteConfigResponse(
@@ -626,8 +794,8 @@ async def list_site_configs(
                 confidence=c.confidence,
                 success_count=c.success_count,
                 failure_count=c.failure_count,
-                created_at=c.created_at or datetime.utcnow(),
-                updated_at=c.updated_at or datetime.utcnow(),
+                created_at=c.created_at or now,
+                updated_at=c.updated_at or now,
             )
             for c in configs
             if c.id
@@ -638,15 +806,15 @@ async def list_site_configs(
 
 @app.get("/configs/{config_id}", response_model=SiteConfigResponse)
 async def get_site_config(config_id: str) -> SiteConfigResponse:
-    settings = get_settings()
-    client = _get_supabase_client(settings)
-    config_manager = ConfigManager(client)
+    client = _get_supabase_client()
+    config_manager = get_config_manager(client)
 
     config = config_manager.get_config_by_id(config_id)
 
     if not config:
         raise HTTPException(status_code=404, detail="Config not found")
 
+    now = datetime.now(timezone.utc)
     return SiteConfigResponse(
         id=str(config.id),
         domain=config.domain,
@@ -658,25 +826,37 @@ async def get_site_config(config_id: str) -> SiteConfigResponse:
         confidence=config.confidence,
         success_count=config.success_count,
         failure_count=config.failure_count,
-        created_at=config.created_at or datetime.utcnow(),
-        updated_at=config.updated_at or datetime.utcnow(),
+        created_at=config.created_at or now,
+        updated_at=config.updated_at or now,
     )
 
 
 @app.delete("/configs/{config_id}")
 async def delete_site_config(config_id: str) -> dict[str, str]:
-    settings = get_settings()
-    client = _get_supabase_client(settings)
-    config_manager = ConfigManager(client)
+    client = _get_supabase_client()
+    config_manager = get_config_manager(client)
 
     config = config_manager.get_config_by_id(config_id)
     if not config:
         raise HTTPException(status_code=404, detail="Config not found")
 
     config_manager.delete_config(config_id)
+    # The crawler's per-URL cache would otherwise keep serving the deleted
+    # config and could save it back after a failed crawl
+    invalidate_site_config_cache(config.domain)
     return {"message": "Config deleted successfully"}
 
 
+@app.post("/settings/refresh")
+async def refresh_settings() -> dict[str, str]:
+    """Drop cached system settings and site configs after they are edited."""
+    client = _get_supabase_client()
+    get_settings_loader(client).clear_cache()
+    get_config_manager(client).invalidate_cache()
+    invalidate_site_config_cache()
+    return {"message": "Settings cache cleared"}
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,6 +1,6 @@
 """Domain models for adaptive crawling system."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
 from typing import Any
@@ -32,7 +32,20 @@ class DocumentFramework(str, Enum):
     GENERIC = "generic"
 
 
-@dataclass
+# Shared default for SiteConfig.excluded_tags; each config gets its own list copy
+_DEFAULT_EXCLUDED_TAGS: tuple[str, ...] = (
+    "nav",
+    "footer",
+    "aside",
+    "header",
+    "script",
+    "style",
+    "noscript",
+    "iframe",
+)
+
+
+@dataclass(slots=True)
 class SiteConfig:
     domain: str
     path_pattern: str
@@ -40,16 +53,7 @@ class SiteConfig:
     excluded_selector: str | None = None
     title_selector: str = "h1"
     excluded_tags: list[str] = field(
-        default_factory=lambda: [
-            "nav",
-            "footer",
-            "aside",
-            "header",
-            "script",
-            "style",
-            "noscript",
-            "iframe",
-        ]
+        default_factory=lambda: list(_DEFAULT_EXCLUDED_TAGS)
     )
     framework_detected: str | None = None
     confidence: float = 0.8
@@ -66,54 +70,36 @@ class SiteConfig:
 
     @classmethod
     def from_db_row(cls, row: dict[str, Any]) -> "SiteConfig":
-        return cls(
-            id=row.get("id"),
-            domain=row["domain"],
-            path_pattern=row.get("path_pattern", "*"),
-            css_selector=row.get("css_selector"),
-            excluded_selector=row.get("excluded_selector"),
-            title_selector=row.get("title_selector", "h1"),
-            excluded_tags=row.get("excluded_tags")
-            or [
-                "nav",
-                "footer",
-                "aside",
-                "header",
-                "script",
-                "style",
-                "noscript",
-                "iframe",
-            ],
-            framework_detected=row.get("framework_detected"),
-            confidence=row.get("confidence", 0.8),
-            success_count=row.get("success_count", 0),
-            failure_count=row.get("failure_count", 0),
-            last_success_at=row.get("last_success_at"),
-            last_failure_at=row.get("last_failure_at"),
-            analysis_prompt=row.get("analysis_prompt"),
-            sample_url=row.get("sample_url"),
-            created_at=row.get("created_at"),
-            updated_at=row.get("updated_at"),
-            created_by=row.get("created_by"),
+        values = {name: row[name] for name in _SITE_CONFIG_FIELDS if name in row}
+        values.setdefault("path_pattern", "*")
+        values["excluded_tags"] = values.get("excluded_tags") or list(
+            _DEFAULT_EXCLUDED_TAGS
         )
+        return cls(**values)
 
     def to_db_dict(self) -> dict[str, Any]:
-        return {
-            "domain": self.domain,
-            "path_pattern": self.path_pattern,
-            "css_selector": self.css_selector,
-            "excluded_selector": self.excluded_selector,
-            "title_selector": self.title_selector,
-            "excluded_tags": self.excluded_tags,
-            "framework_detected": self.framework_detected,
-            "confidence": self.confidence,
-            "analysis_prompt": self.analysis_prompt,
-            "sample_url": self.sample_url,
-            "created_by": self.created_by,
-        }
-
-
-@dataclass
+        return {name: getattr(self, name) for name in _SITE_CONFIG_DB_FIELDS}
+
+
+# Columns read back from crawl_site_configs rows
+_SITE_CONFIG_FIELDS = tuple(f.name for f in fields(SiteConfig) if f.init)
+# Columns written on save; ids, counters and timestamps are managed by the DB
+_SITE_CONFIG_DB_FIELDS = (
+    "domain",
+    "path_pattern",
+    "css_selector",
+    "excluded_selector",
+    "title_selector",
+    "excluded_tags",
+    "framework_detected",
+    "confidence",
+    "analysis_prompt",
+    "sample_url",
+    "created_by",
+)
+
+
+@dataclass(slots=True)
 class AnalysisResult:
     css_selector: str
     excluded_selector: str
@@ -123,19 +109,19 @@ class AnalysisResult:
     reasoning: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     status: ValidationStatus
     message: str
     content_length: int = 0
     word_count: int = 0
-    is_valid: bool = field(init=False)
 
-    def __post_init__(self) -> None:
-        self.is_valid = self.status == ValidationStatus.OK
+    @property
+    def is_valid(self) -> bool:
+        return self.status is ValidationStatus.OK
 
 
-@dataclass
+@dataclass(slots=True)
 class CrawlContext:
     url: str
     user_prompt: str | None = None
@@ -199,4 +185,8 @@ FRAMEWORK_PRESETS: dict[str, dict[str, str]] = {
 
 
 def get_framework_preset(framework: str) -> dict[str, str] | None:
-    return FRAMEWORK_PRESETS.get(framework.lower())
+    # Keys are already lowercase, so the usual exact name skips the lower() copy
+    preset = FRAMEWORK_PRESETS.get(framework)
+    if preset is None:
+        preset = FRAMEWORK_PRESETS.get(framework.lower())
+    return preset
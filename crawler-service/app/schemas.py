@@ -1,6 +1,6 @@
 """Pydantic schemas for API request/response models."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
 
@@ -74,7 +74,8 @@ class CrawlResult(BaseModel):
     parent_url: str | None = None
     depth: int = 0
     metadata: dict[str, Any] = Field(default_factory=dict)
-    crawled_at: datetime = Field(default_factory=datetime.utcnow)
+    # Both crawlers pass crawled_at explicitly; this only covers direct use
+    crawled_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
 class CrawlJobResponse(BaseModel):
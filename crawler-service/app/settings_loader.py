@@ -1,40 +1,51 @@
 """Dynamic settings loader from database system_settings table."""
 
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from typing import Any
 
 from supabase import Client
 
+# How long a loaded config is reused before system_settings is read again
+SETTINGS_CACHE_TTL_SECONDS = 60.0
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class LLMSettings:
     provider: str = "openai/gpt-4o-mini"
     base_url: str = ""
     api_key: str = ""
     temperature: float = 0.1
     max_tokens: int = 2000
+    max_concurrency: int = 8
+    # 0 disables the per-minute request limit
+    requests_per_minute: int = 0
 
     @property
     def enabled(self) -> bool:
         return bool(self.api_key)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AdaptiveSettings:
     min_confidence: float = 0.5
     max_retry: int = 2
     min_content_length: int = 100
     min_word_count: int = 20
+    max_concurrency: int = 64
+    max_analysis_chars: int = 65536
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CrawlerSettings:
     timeout: int = 60000
     max_depth: int = 3
     max_pages: int = 100
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CrawlerConfig:
     llm: LLMSettings
     adaptive: AdaptiveSettings
@@ -53,12 +64,16 @@ class CrawlerConfig:
                 api_key=llm_data.get("apiKey", ""),
                 temperature=float(llm_data.get("temperature", 0.1)),
                 max_tokens=int(llm_data.get("maxTokens", 2000)),
+                max_concurrency=int(llm_data.get("maxConcurrency", 8)),
+                requests_per_minute=int(llm_data.get("requestsPerMinute", 0)),
             ),
             adaptive=AdaptiveSettings(
                 min_confidence=float(adaptive_data.get("minConfidence", 0.5)),
                 max_retry=int(adaptive_data.get("maxRetry", 2)),
                 min_content_length=int(adaptive_data.get("minContentLength", 100)),
                 min_word_count=int(adaptive_data.get("minWordCount", 20)),
+                max_concurrency=int(adaptive_data.get("maxConcurrency", 64)),
+                max_analysis_chars=int(adaptive_data.get("maxAnalysisChars", 65536)),
             ),
             crawler=CrawlerSettings(
                 timeout=int(crawler_data.get("timeout", 60000)),
@@ -77,14 +92,38 @@ class CrawlerConfig:
 
 
 class SettingsLoader:
-    def __init__(self, client: Client) -> None:
+    def __init__(
+        self, client: Client, ttl_seconds: float = SETTINGS_CACHE_TTL_SECONDS
+    ) -> None:
         self._client = client
+        self._ttl_seconds = ttl_seconds
         self._cache: CrawlerConfig | None = None
+        self._expires_at = 0.0
+        # Only one caller reloads an expired config; the rest wait for it
+        self._lock = threading.Lock()
 
-    def get_crawler_config(self, force_refresh: bool = False) -> CrawlerConfig:
-        if self._cache is not None and not force_refresh:
+    def _cached(self) -> CrawlerConfig | None:
+        if self._cache is not None and time.monotonic() < self._expires_at:
             return self._cache
+        return None
 
+    def cached_crawler_config(self) -> CrawlerConfig | None:
+        """The loaded config if it is still fresh; never queries the database."""
+        return self._cached()
+
+    def get_crawler_config(self, force_refresh: bool = False) -> CrawlerConfig:
+        if not force_refresh and (config := self._cached()) is not None:
+            return config
+
+        with self._lock:
+            if not force_refresh and (config := self._cached()) is not None:
+                return config
+            config = self._load()
+            self._cache = config
+            self._expires_at = time.monotonic() + self._ttl_seconds
+            return config
+
+    def _load(self) -> CrawlerConfig:
         try:
             response = (
                 self._client.table("system_settings")
@@ -105,15 +144,12 @@ class SettingsLoader:
             if crawler_data:
                 config = CrawlerConfig.from_dict(crawler_data)
                 if not config.llm.api_key and chat_data.get("apiKey"):
-                    config.llm = self._llm_from_chat_config(chat_data)
-                self._cache = config
-            else:
-                self._cache = CrawlerConfig.default()
+                    config = replace(config, llm=self._llm_from_chat_config(chat_data))
+                return config
+            return CrawlerConfig.default()
 
         except Exception:
-            self._cache = CrawlerConfig.default()
-
-        return self._cache
+            return CrawlerConfig.default()
 
     def _llm_from_chat_config(self, chat_data: dict[str, Any]) -> LLMSettings:
         provider = chat_data.get("provider", "openai-compatible")
@@ -136,11 +172,6 @@ class SettingsLoader:
         self._cache = None
 
 
-_loader: SettingsLoader | None = None
-
-
+@lru_cache(maxsize=1)
 def get_settings_loader(client: Client) -> SettingsLoader:
-    global _loader
-    if _loader is None:
-        _loader = SettingsLoader(client)
-    return _loader
+    return SettingsLoader(client)
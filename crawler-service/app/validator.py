@@ -1,18 +1,34 @@
 """Content validation for crawled pages."""
 
-import re
-
 from app.models import ValidationResult, ValidationStatus
 from app.settings_loader import AdaptiveSettings
 
 
+# Equivalent to ^\[.*?\]\(.*?\)$|^[-*]\s*\[.*?\]|^#+\s*$ on a stripped line,
+# using plain string checks instead of a backtracking regex
+def _is_link_like(line: str) -> bool:
+    """Match markdown link lines, link list items and empty headings."""
+    first = line[:1]
+    if first == "[":
+        # "[text](url)": "](" after the opening bracket, ")" after the "("
+        close = line.find("](", 1)
+        return close != -1 and close + 2 < len(line) and line.endswith(")")
+    if first == "-" or first == "*":
+        rest = line[1:].lstrip()
+        return rest.startswith("[") and "]" in rest[1:]
+    if first == "#":
+        return not line.lstrip("#").strip()
+    return False
+
+
 class ContentValidator:
     def __init__(self, adaptive_settings: AdaptiveSettings) -> None:
         self._min_content_length = adaptive_settings.min_content_length
         self._min_word_count = adaptive_settings.min_word_count
 
     def validate(self, content: str | None) -> ValidationResult:
-        if not content or not content.strip():
+        clean_content = content.strip() if content else ""
+        if not clean_content:
             return ValidationResult(
                 status=ValidationStatus.EMPTY,
                 message="Extracted content is empty",
@@ -20,7 +36,6 @@ class ContentValidator:
                 word_count=0,
             )
 
-        clean_content = content.strip()
         content_length = len(clean_content)
         word_count = len(clean_content.split())
 
@@ -40,7 +55,7 @@ class ContentValidator:
                 word_count=word_count,
             )
 
-        if self._is_navigation_content(clean_content):
+        if self._is_navigation_content(clean_content, word_count):
             return ValidationResult(
                 status=ValidationStatus.LOW_QUALITY,
                 message="Content appears to be navigation/menu items only",
@@ -55,27 +70,42 @@ class ContentValidator:
             word_count=word_count,
         )
 
-    def _is_navigation_content(self, content: str) -> bool:
-        lines = [line.strip() for line in content.split("\n") if line.strip()]
-
-        if len(lines) < 5:
+    def _is_navigation_content(self, content: str, total_words: int) -> bool:
+        line_count = 0
+        short_lines = 0
+        link_like_lines = 0
+        unique_words: set[str] = set()
+        # The uniqueness check only applies past 20 words, and the unique count
+        # only grows, so word collection stops once the ratio can't drop below
+        # the threshold
+        collect_words = total_words > 20
+
+        # One walk over the lines gathers every counter the checks below use
+        for raw_line in content.split("\n"):
+            line = raw_line.strip()
+            if not line:
+                continue
+            line_count += 1
+            if len(line) < 40:
+                short_lines += 1
+            if _is_link_like(line):
+                link_like_lines += 1
+            if collect_words:
+                unique_words.update(line.lower().split())
+                if len(unique_words) / total_words >= 0.3:
+                    collect_words = False
+
+        if line_count < 5:
             return False
 
-        short_lines = sum(1 for line in lines if len(line) < 40)
-        short_line_ratio = short_lines / len(lines)
-
+        short_line_ratio = short_lines / line_count
         if short_line_ratio > 0.85:
             return True
 
-        link_pattern = re.compile(r"^\[.*?\]\(.*?\)$|^[-*]\s*\[.*?\]|^#+\s*$")
-        link_like_lines = sum(1 for line in lines if link_pattern.match(line))
-        link_ratio = link_like_lines / len(lines)
-
+        link_ratio = link_like_lines / line_count
         if link_ratio > 0.7:
             return True
 
-        unique_words = set(content.lower().split())
-        total_words = len(content.split())
         if total_words > 20:
             uniqueness_ratio = len(unique_words) / total_words
             if uniqueness_ratio < 0.3:
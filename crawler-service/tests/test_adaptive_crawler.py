@@ -0,0 +1,72 @@
+"""Tests for AdaptiveCrawler's HTML helpers."""
+
+import asyncio
+import os
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+from app.adaptive_crawler import (  # noqa: E402
+    AdaptiveCrawler,
+    _compile_title_selectors,
+    close_adaptive_crawler,
+    get_adaptive_crawler,
+)
+from app.config import get_settings  # noqa: E402
+from app.settings_loader import CrawlerConfig  # noqa: E402
+
+XHTML_PAGE = """<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN"
+  "http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml">
+<head><title>XHTML Guide</title><script>var x = 1;</script></head>
+<body><main><h1 class="doc-title">Getting started</h1>
+<p>Install the package and run the setup command.</p></main></body>
+</html>"""
+
+
+class ExtractTitleTest(unittest.TestCase):
+    def test_xhtml_with_encoding_declaration(self) -> None:
+        title = AdaptiveCrawler._extract_title_from_html(XHTML_PAGE, ())
+        self.assertEqual(title, "XHTML Guide")
+
+    def test_xhtml_with_title_selector(self) -> None:
+        title = AdaptiveCrawler._extract_title_from_html(
+            XHTML_PAGE, _compile_title_selectors("h1.doc-title")
+        )
+        self.assertEqual(title, "Getting started")
+
+
+class PrepareHtmlForAnalysisTest(unittest.TestCase):
+    def test_xhtml_is_cleaned(self) -> None:
+        prepared, text_chars = AdaptiveCrawler._prepare_html_for_analysis(
+            XHTML_PAGE, 0
+        )
+        self.assertNotIn("<?xml", prepared)
+        self.assertNotIn("<script", prepared)
+        self.assertIn("Getting started", prepared)
+        self.assertGreater(text_chars, 0)
+
+
+
+class GetAdaptiveCrawlerTest(unittest.TestCase):
+    def test_client_swap_outside_event_loop(self) -> None:
+        settings = get_settings()
+        config = CrawlerConfig.default()
+
+        with patch.object(AdaptiveCrawler, "close", AsyncMock()) as close:
+            first = get_adaptive_crawler(MagicMock(), settings, config)
+            second = get_adaptive_crawler(MagicMock(), settings, config)
+            self.assertIsNot(first, second)
+            close.assert_not_awaited()
+
+            asyncio.run(close_adaptive_crawler())
+
+        # Both the replaced crawler and the current one are closed
+        self.assertEqual(close.await_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
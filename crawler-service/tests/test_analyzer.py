@@ -0,0 +1,104 @@
+"""Tests for PageAnalyzer's module-level helpers."""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.analyzer import (
+    LLM_RETRY_AFTER_LIMIT,
+    LLM_RETRY_BASE_DELAY,
+    LLM_RETRY_MAX_DELAY,
+    PageAnalyzer,
+    _clean_html,
+    _llm_retry_delay,
+    parse_html_document,
+)
+
+XHTML_PAGE = "\ufeff" + """<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml">
+<head><title>XHTML</title><style>p { color: red }</style></head>
+<body><p style="margin: 0" data-id="1" class="intro">Hello</p></body>
+</html>"""
+
+
+class ParseHtmlDocumentTest(unittest.TestCase):
+    def test_accepts_xml_declaration(self) -> None:
+        tree = parse_html_document(XHTML_PAGE)
+        self.assertEqual(tree.findtext(".//title"), "XHTML")
+
+
+class CleanHtmlTest(unittest.TestCase):
+    def test_xhtml_is_cleaned(self) -> None:
+        cleaned = _clean_html(XHTML_PAGE)
+        self.assertNotIn("<?xml", cleaned)
+        self.assertNotIn("color: red", cleaned)
+        self.assertNotIn("data-id", cleaned)
+        self.assertNotIn("style=", cleaned)
+        self.assertIn('class="intro"', cleaned)
+
+
+
+class ExtractJsonObjectTest(unittest.TestCase):
+    def test_object_in_prose(self) -> None:
+        text = 'Here is the result:\n{"css_selector": "main", "confidence": 0.9}\nDone.'
+        self.assertEqual(
+            PageAnalyzer._extract_json_object(text),
+            {"css_selector": "main", "confidence": 0.9},
+        )
+
+    def test_nested_object_and_braces_in_strings(self) -> None:
+        text = 'Answer: {"css_selector": "div[data-x=\'{}\']", "meta": {"a": 1}} ok'
+        self.assertEqual(
+            PageAnalyzer._extract_json_object(text),
+            {"css_selector": "div[data-x='{}']", "meta": {"a": 1}},
+        )
+
+    def test_skips_invalid_leading_brace(self) -> None:
+        text = 'Use {main} as selector: {"css_selector": "main"}'
+        self.assertEqual(
+            PageAnalyzer._extract_json_object(text), {"css_selector": "main"}
+        )
+
+    def test_no_object(self) -> None:
+        self.assertIsNone(PageAnalyzer._extract_json_object("no json here"))
+        self.assertIsNone(PageAnalyzer._extract_json_object("{broken"))
+
+
+def _error_with_headers(headers: dict[str, str] | None) -> Exception:
+    error = Exception("rate limited")
+    error.response = SimpleNamespace(headers=headers)  # type: ignore[attr-defined]
+    return error
+
+
+class LlmRetryDelayTest(unittest.TestCase):
+    def test_honours_retry_after(self) -> None:
+        error = _error_with_headers({"retry-after": "3"})
+        self.assertEqual(_llm_retry_delay(error, attempt=1), 3.0)
+
+    def test_caps_retry_after(self) -> None:
+        error = _error_with_headers({"retry-after": "3600"})
+        self.assertEqual(_llm_retry_delay(error, attempt=1), LLM_RETRY_AFTER_LIMIT)
+
+    def test_negative_retry_after_is_zero(self) -> None:
+        error = _error_with_headers({"retry-after": "-5"})
+        self.assertEqual(_llm_retry_delay(error, attempt=1), 0.0)
+
+    def test_backoff_without_usable_header(self) -> None:
+        for error in (
+            Exception("no response"),
+            _error_with_headers({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}),
+        ):
+            with patch("app.analyzer.random.uniform", return_value=0.0):
+                self.assertEqual(
+                    _llm_retry_delay(error, attempt=1), LLM_RETRY_BASE_DELAY
+                )
+                self.assertEqual(
+                    _llm_retry_delay(error, attempt=2), LLM_RETRY_BASE_DELAY * 2
+                )
+                self.assertEqual(
+                    _llm_retry_delay(error, attempt=20), LLM_RETRY_MAX_DELAY
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Tests for ConfigManager path matching and counter buffering."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from app.config_manager import ConfigManager
+
+
+def _matches(path: str, pattern: str) -> bool:
+    compiled = ConfigManager._compile_glob(pattern)
+    return ConfigManager._match_path(path, pattern, compiled)
+
+
+class MatchPathTest(unittest.TestCase):
+    def test_star_matches_everything(self) -> None:
+        self.assertTrue(_matches("/", "*"))
+        self.assertTrue(_matches("/docs/intro", "*"))
+
+    def test_prefix_pattern(self) -> None:
+        self.assertTrue(_matches("/docs", "/docs/*"))
+        self.assertTrue(_matches("/docs/", "/docs/*"))
+        self.assertTrue(_matches("/docs/guide/intro", "/docs/*"))
+        self.assertFalse(_matches("/blog/post", "/docs/*"))
+
+    def test_prefix_pattern_keeps_stored_config_semantics(self) -> None:
+        # Configs saved before the fast path matched on a bare prefix
+        self.assertTrue(_matches("/docs-v2/intro", "/docs/*"))
+
+    def test_literal_pattern(self) -> None:
+        self.assertTrue(_matches("/docs/intro", "/docs/intro"))
+        self.assertTrue(_matches("/docs/intro/", "/docs/intro"))
+        self.assertFalse(_matches("/docs/intro2", "/docs/intro"))
+
+    def test_glob_pattern(self) -> None:
+        self.assertTrue(_matches("/v2/docs/intro", "/v*/docs/*"))
+        self.assertTrue(_matches("/docs/page1", "/docs/page?"))
+        self.assertFalse(_matches("/docs/page10", "/docs/page?"))
+        self.assertFalse(_matches("/api/docs/intro", "/v*/docs/*"))
+
+    def test_compile_glob_skips_plain_patterns(self) -> None:
+        self.assertIsNone(ConfigManager._compile_glob("*"))
+        self.assertIsNone(ConfigManager._compile_glob("/docs/*"))
+        self.assertIsNotNone(ConfigManager._compile_glob("/v*/docs/*"))
+
+
+class ExtractPathPatternTest(unittest.TestCase):
+    def test_patterns(self) -> None:
+        self.assertEqual(ConfigManager.extract_path_pattern("/"), "*")
+        self.assertEqual(ConfigManager.extract_path_pattern("/docs"), "/docs/*")
+        self.assertEqual(
+            ConfigManager.extract_path_pattern("/docs/guide/intro"), "/docs/guide/*"
+        )
+
+
+class FlushCountersTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = MagicMock()
+        self.manager = ConfigManager(self.client)
+
+    def test_nothing_pending(self) -> None:
+        self.assertEqual(self.manager.flush_counters(), 0)
+        self.client.rpc.assert_not_called()
+
+    def test_flush_sends_one_rpc(self) -> None:
+        self.manager.record_success("a")
+        self.manager.record_success("a")
+        self.manager.record_failure("a")
+        self.manager.record_failure("b")
+
+        self.assertEqual(self.manager.flush_counters(), 2)
+
+        self.client.rpc.assert_called_once()
+        name, params = self.client.rpc.call_args.args
+        self.assertEqual(name, "increment_site_config_counters")
+        self.assertCountEqual(
+            params["updates"],
+            [
+                {"id": "a", "success_delta": 2, "failure_delta": 1},
+                {"id": "b", "success_delta": 0, "failure_delta": 1},
+            ],
+        )
+        self.assertFalse(self.manager.has_pending_counters)
+
+    def test_failed_flush_requeues_counts(self) -> None:
+        self.manager.record_success("a")
+        self.client.rpc.return_value.execute.side_effect = RuntimeError("down")
+
+        with self.assertRaises(RuntimeError):
+            self.manager.flush_counters()
+        self.assertTrue(self.manager.has_pending_counters)
+
+        # Counts recorded after the failure are merged with the re-queued ones
+        self.manager.record_success("a")
+        self.client.rpc.return_value.execute.side_effect = None
+        self.assertEqual(self.manager.flush_counters(), 1)
+
+        _, params = self.client.rpc.call_args.args
+        self.assertEqual(
+            params["updates"], [{"id": "a", "success_delta": 2, "failure_delta": 0}]
+        )
+        self.assertFalse(self.manager.has_pending_counters)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""Tests for the basic CrawlerService."""
+
+import asyncio
+import os
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+from app.crawler import CrawlerService  # noqa: E402
+
+
+class CrawlSingleTest(unittest.TestCase):
+    def test_do_crawl_single_uses_shared_run_config(self) -> None:
+        service = CrawlerService()
+        raw = SimpleNamespace(
+            url="https://example.com/docs",
+            markdown="# Docs\n\nHello",
+            metadata={"title": "Docs", "description": "d", "keywords": None},
+            status_code=200,
+        )
+        browser = SimpleNamespace(arun=AsyncMock(return_value=raw))
+
+        with patch.object(
+            service, "_ensure_crawler", AsyncMock(return_value=browser)
+        ):
+            first = asyncio.run(service._do_crawl_single("https://example.com/docs"))
+            asyncio.run(service._do_crawl_single("https://example.com/docs"))
+
+        self.assertEqual(first.url, "https://example.com/docs")
+        self.assertEqual(first.title, "Docs")
+        self.assertEqual(first.content, "# Docs\n\nHello")
+        self.assertEqual(first.metadata["status_code"], 200)
+        configs = [call.kwargs["config"] for call in browser.arun.await_args_list]
+        self.assertIs(configs[0], service._single_run_config)
+        self.assertIs(configs[1], service._single_run_config)
+        self.assertEqual(
+            service._single_run_config.wait_until, service.settings.crawler_wait_until
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Tests for batched document writes in Database."""
+
+import hashlib
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+from app.database import Database  # noqa: E402
+from app.schemas import CrawlResult  # noqa: E402
+
+
+def _page(url: str, content: str) -> CrawlResult:
+    return CrawlResult(url=url, title="Page", content=content)
+
+
+def _hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class InsertDocumentsBatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        with patch("app.database.create_client", return_value=MagicMock()):
+            self.db = Database()
+        self.table = self.db.client.table.return_value
+        self.select = self.table.select.return_value.eq.return_value.in_.return_value
+        self.upsert = self.table.upsert.return_value
+
+    def test_requires_user_id(self) -> None:
+        with self.assertRaises(ValueError):
+            self.db.insert_documents_batch("kb", [_page("https://a.dev/1", "x")])
+
+    def test_empty_batch_makes_no_requests(self) -> None:
+        self.assertEqual(self.db.insert_documents_batch("kb", [], user_id="u"), [])
+        self.db.client.table.assert_not_called()
+
+    def test_upserts_changed_pages_in_one_request(self) -> None:
+        self.select.execute.return_value.data = []
+        self.upsert.execute.return_value.data = [{"id": "d1"}, {"id": "d2"}]
+
+        ids = self.db.insert_documents_batch(
+            "kb",
+            [_page("https://a.dev/1", "one"), _page("https://a.dev/2", "two")],
+            user_id="u",
+        )
+
+        self.assertEqual(ids, ["d1", "d2"])
+        self.table.upsert.assert_called_once()
+        rows = self.table.upsert.call_args.args[0]
+        self.assertEqual(
+            [row["source_url"] for row in rows], ["https://a.dev/1", "https://a.dev/2"]
+        )
+        self.assertEqual(rows[0]["content_hash"], _hash("one"))
+        self.assertEqual(
+            self.table.upsert.call_args.kwargs["on_conflict"], "kb_id,source_url"
+        )
+
+    def test_unchanged_pages_are_not_rewritten(self) -> None:
+        self.select.execute.return_value.data = [
+            {"id": "d1", "source_url": "https://a.dev/1", "content_hash": _hash("one")},
+            {"id": "d2", "source_url": "https://a.dev/2", "content_hash": "stale"},
+        ]
+        self.upsert.execute.return_value.data = [{"id": "d2"}]
+
+        ids = self.db.insert_documents_batch(
+            "kb",
+            [_page("https://a.dev/1", "one"), _page("https://a.dev/2", "two")],
+            user_id="u",
+        )
+
+        self.assertEqual(ids, ["d1", "d2"])
+        rows = self.table.upsert.call_args.args[0]
+        self.assertEqual([row["source_url"] for row in rows], ["https://a.dev/2"])
+
+    def test_all_unchanged_skips_upsert(self) -> None:
+        self.select.execute.return_value.data = [
+            {"id": "d1", "source_url": "https://a.dev/1", "content_hash": _hash("one")},
+        ]
+
+        ids = self.db.insert_documents_batch(
+            "kb", [_page("https://a.dev/1", "one")], user_id="u"
+        )
+
+        self.assertEqual(ids, ["d1"])
+        self.table.upsert.assert_not_called()
+
+    def test_duplicate_url_in_batch_keeps_latest(self) -> None:
+        self.select.execute.return_value.data = []
+        self.upsert.execute.return_value.data = [{"id": "d1"}]
+
+        self.db.insert_documents_batch(
+            "kb",
+            [_page("https://a.dev/1", "old"), _page("https://a.dev/1", "new")],
+            user_id="u",
+        )
+
+        rows = self.table.upsert.call_args.args[0]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["content"], "new")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -849,6 +849,10 @@ export type Database = {
         Args: { increment_by?: number; kb_id_param: string }
         Returns: undefined
       }
+      increment_site_config_counters: {
+        Args: { updates: Json }
+        Returns: undefined
+      }
       increment_site_config_failure: {
         Args: { config_id: string }
         Returns: undefined
@@ -0,0 +1,19 @@
+-- Apply success/failure counters for many site configs in one statement
+-- The crawler service buffers per-page outcomes and flushes them periodically
+-- Input: [{"id": "<uuid>", "success_delta": 3, "failure_delta": 1}, ...]
+
+CREATE OR REPLACE FUNCTION increment_site_config_counters(updates JSONB)
+RETURNS VOID AS $$
+BEGIN
+    UPDATE crawl_site_configs AS c
+    SET 
+        success_count = c.success_count + u.success_delta,
+        failure_count = c.failure_count + u.failure_delta,
+        last_success_at = CASE WHEN u.success_delta > 0 THEN NOW() ELSE c.last_success_at END,
+        last_failure_at = CASE WHEN u.failure_delta > 0 THEN NOW() ELSE c.last_failure_at END,
+        confidence = LEAST(1.0, GREATEST(0.1,
+            c.confidence + 0.01 * u.success_delta - 0.05 * u.failure_delta))
+    FROM jsonb_to_recordset(updates) AS u(id UUID, success_delta INTEGER, failure_delta INTEGER)
+    WHERE c.id = u.id;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,47 @@
+-- Make (kb_id, source_url) unique so crawled documents can be upserted in batches
+-- Uploaded documents have a NULL source_url and are not affected
+
+-- A URL crawled twice into the same knowledge base may have left duplicate
+-- rows. Keep the most recently updated one and delete the rest; their
+-- document_chunks (and embeddings) are removed with them by ON DELETE CASCADE
+-- and crawl_pages.document_id is set to NULL. knowledge_bases.document_count
+-- is decremented by the rows removed from each knowledge base.
+-- See deployment/README.md.
+DO $$
+DECLARE
+    removed INTEGER;
+BEGIN
+    WITH ranked AS (
+        SELECT id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY kb_id, source_url
+                   ORDER BY updated_at DESC, id DESC
+               ) AS rn
+        FROM documents
+        WHERE source_url IS NOT NULL
+    ),
+    deleted AS (
+        DELETE FROM documents d
+        USING ranked r
+        WHERE d.id = r.id AND r.rn > 1
+        RETURNING d.kb_id
+    ),
+    per_kb AS (
+        SELECT kb_id, COUNT(*) AS n FROM deleted GROUP BY kb_id
+    ),
+    adjusted AS (
+        UPDATE knowledge_bases kb
+        SET document_count = GREATEST(0, kb.document_count - per_kb.n),
+            updated_at = NOW()
+        FROM per_kb
+        WHERE kb.id = per_kb.kb_id
+        RETURNING per_kb.n
+    )
+    SELECT COALESCE(SUM(n), 0) INTO removed FROM adjusted;
+
+    IF removed > 0 THEN
+        RAISE NOTICE 'Removed % duplicate crawled document(s) and their chunks', removed;
+    END IF;
+END $$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_docs_kb_source_url ON documents(kb_id, source_url);